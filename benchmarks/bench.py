@@ -0,0 +1,150 @@
+"""Time the Quantexo hot paths on synthetic NEPSE-scale data.
+
+Each case generates a sheet-shaped CSV (see :mod:`quantexo.synthetic`) and
+times every stage separately, so nothing touches Google Sheets::
+
+    python -m benchmarks.bench                        # default grid
+    python -m benchmarks.bench --symbols 300 --years 10 --output bench.json
+    python -m benchmarks.bench --compare bench.json   # ratios against an earlier run
+
+Results are JSON: run metadata (commit, versions) plus one record per
+case and stage with the best, median and mean of ``--repeat`` runs.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import plotly
+
+from quantexo.charts import price_chart
+from quantexo.data import MarketData, read_prices
+from quantexo.scan import scan_market, scan_market_batch
+from quantexo.signal_index import SignalIndex
+from quantexo.signals import detect_signals
+from quantexo.synthetic import write_sheet
+
+DEFAULT_CASES = [(1, 1), (50, 5), (300, 1), (300, 10)]
+# Stages are reported as slower only past this ratio, to ride out timer noise
+REGRESSION_RATIO = 1.2
+
+
+def timed(fn, repeat):
+    """Run ``fn`` ``repeat`` times after one untimed warm-up; returns (timings, last result)."""
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def detect_all(market):
+    """Per-symbol ``detect_signals`` over every full history."""
+    for symbol in market.symbols:
+        detect_signals(market.get(symbol))
+
+
+def figure(market, index, symbol):
+    df = market.get(symbol)
+    df['point_change'] = df['close'].diff().fillna(0)
+    return price_chart(df, index.for_symbol(symbol), symbol)
+
+
+def run_case(n_symbols, years, repeat, seed=0):
+    """Time every stage for one dataset size; returns a list of records."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_sheet(os.path.join(tmp, 'sheet.csv'), n_symbols, years, seed)
+        size = os.path.getsize(path)
+        ingest, (prices, rejected) = timed(lambda: read_prices(path), repeat)
+
+    market = MarketData.from_frame(prices, rejected)
+    symbol = market.symbols[0]
+    stages = {'ingest': ingest}
+    stages['detect_signals'], _ = timed(lambda: detect_all(market), repeat)
+    stages['scan_all'], _ = timed(lambda: scan_market_batch(market), repeat)
+    stages['scan_all_loop'], _ = timed(lambda: scan_market(market, executor='serial'), repeat)
+    stages['signal_index'], index = timed(lambda: SignalIndex.build(market), repeat)
+    stages['figure'], fig = timed(lambda: figure(market, index, symbol), repeat)
+    stages['figure_json'], payload = timed(fig.to_json, repeat)
+
+    case = {'symbols': n_symbols, 'years': years, 'rows': len(market), 'csv_bytes': size,
+            'figure_bytes': len(payload)}
+    return [
+        dict(case, stage=stage, repeat=repeat, best_s=min(timings),
+             median_s=statistics.median(timings), mean_s=statistics.fmean(timings))
+        for stage, timings in stages.items()
+    ]
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'plotly': plotly.__version__,
+    }
+
+
+def compare(results, baseline):
+    """Report each stage's median against the same case in ``baseline``."""
+    key = lambda r: (r['symbols'], r['years'], r['stage'])
+    before = {key(r): r for r in baseline['results']}
+    for record in results:
+        old = before.get(key(record))
+        if old is None:
+            continue
+        ratio = record['median_s'] / old['median_s'] if old['median_s'] else float('inf')
+        flag = '  SLOWER' if ratio > REGRESSION_RATIO else ''
+        print(f"{record['symbols']:>4} sym {record['years']:>4g} y  {record['stage']:<15}"
+              f"{old['median_s']:9.4f}s -> {record['median_s']:9.4f}s  x{ratio:.2f}{flag}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--symbols', type=int, nargs='+', help="symbol counts (default: the built-in grid)")
+    parser.add_argument('--years', type=float, nargs='+', default=[1], help="years of daily bars per symbol")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the JSON results here instead of stdout")
+    parser.add_argument('--compare', help="earlier results file to compare medians against")
+    args = parser.parse_args(argv)
+
+    cases = DEFAULT_CASES if args.symbols is None else [(s, y) for s in args.symbols for y in args.years]
+    results = []
+    for n_symbols, years in cases:
+        print(f"benchmarking {n_symbols} symbols x {years:g} years", file=sys.stderr)
+        results.extend(run_case(n_symbols, years, args.repeat, args.seed))
+
+    report = {'meta': metadata(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Cold-start and per-rerun latency of the Streamlit dashboard.
+
+``import`` times the dashboard's module imports in fresh interpreters, the
+part of a cold start paid before the script draws anything. With Streamlit
+installed, the script itself is then driven through ``AppTest`` against a
+synthetic sheet: the first run (data load and signal index), a rerun with
+no widget changed, the first and a repeated chart view and Scan All::
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --symbols 300 --years 10 --output startup.json
+
+Every stage is reported against its target in :data:`TARGETS`.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench import metadata
+from quantexo.synthetic import synthetic_symbols, write_sheet
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'smart_money_dashboard.py')
+# Everything the dashboard imports besides Streamlit
+APP_MODULES = [
+    'pandas', 'quantexo.backtest', 'quantexo.charts', 'quantexo.data', 'quantexo.metrics',
+    'quantexo.sector_analytics', 'quantexo.sectors', 'quantexo.shared', 'quantexo.signals', 'quantexo.stream',
+]
+# Seconds; the first run is dominated by the data load and grows with the sheet
+TARGETS = {
+    'import': 0.6,
+    'first_run': 5.0,
+    'rerun': 0.1,
+    'chart_first': 1.0,
+    'chart_rerun': 0.15,
+    'scan_all': 0.3,
+}
+
+
+def time_imports(repeat):
+    code = f"import time; start = time.perf_counter(); import {', '.join(APP_MODULES)}; print(time.perf_counter() - start)"
+    root = os.path.dirname(SCRIPT)
+    return [float(subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                 check=True, cwd=root).stdout) for _ in range(repeat)]
+
+
+def _button(at, label):
+    return next(button for button in at.button if button.label == label)
+
+
+def _timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    seconds = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"dashboard raised: {at.exception[0].value}")
+    return seconds
+
+
+def time_script(source, symbol, repeat):
+    """Stage timings of the dashboard script, or {} without Streamlit."""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("streamlit is not installed; timing imports only", file=sys.stderr)
+        return {}
+
+    os.environ['QUANTEXO_DATA'] = source
+    at = AppTest.from_file(SCRIPT, default_timeout=120)
+    stages = {'first_run': [_timed_run(at)]}
+    stages['rerun'] = [_timed_run(at) for _ in range(repeat)]
+
+    at.text_input[0].input(symbol)
+    _button(at, "Search").click()
+    stages['chart_first'] = [_timed_run(at)]
+    # The symbol stays selected in session state, so plain reruns redraw its chart
+    stages['chart_rerun'] = [_timed_run(at) for _ in range(repeat)]
+
+    stages['scan_all'] = []
+    for _ in range(repeat):
+        _button(at, "Scan All").click()
+        stages['scan_all'].append(_timed_run(at))
+    return stages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=300)
+    parser.add_argument('--years', type=float, default=1)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="write the JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    stages = {'import': time_imports(args.repeat)}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = write_sheet(os.path.join(tmp, 'sheet.csv'), args.symbols, args.years)
+        stages.update(time_script(source, synthetic_symbols(args.symbols)[0], args.repeat))
+
+    results = []
+    for stage, timings in stages.items():
+        median = statistics.median(timings)
+        results.append({'symbols': args.symbols, 'years': args.years, 'stage': stage, 'repeat': len(timings),
+                        'best_s': min(timings), 'median_s': median, 'target_s': TARGETS[stage],
+                        'ok': median <= TARGETS[stage]})
+        print(f"{stage:<12}{median:9.4f}s  target {TARGETS[stage]:6.2f}s  {'ok' if median <= TARGETS[stage] else 'MISSED'}",
+              file=sys.stderr)
+
+    report = {'meta': metadata(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+    return 0 if all(record['ok'] for record in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
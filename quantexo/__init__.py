@@ -0,0 +1 @@
+"""Quantexo core: market data loading and smart-money signal detection."""
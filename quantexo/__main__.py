@@ -0,0 +1,5 @@
+import sys
+
+from quantexo.cli import main
+
+sys.exit(main())
@@ -0,0 +1,131 @@
+"""Vectorized forward-return backtest of detected signals.
+
+Each signal is entered at the close of its bar and followed for the next
+``N`` bars of the same symbol. All signals of the market are evaluated at
+once on the :class:`~quantexo.data.MarketData` arrays: forward returns are
+offset lookups and the excursions are running extremes over a strided
+window of the following highs and lows.
+
+Returns, excursions and hits are signed in the signal's direction, so a
+bearish signal followed by a drop has a positive return.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from quantexo.sectors import symbol_to_sector
+from quantexo.signals import BEARISH_TAGS
+
+HORIZONS = (1, 5, 10, 20)
+GROUPINGS = ('tag', 'symbol', 'sector')
+
+
+def _signal_rows(market, signals):
+    """Each signal's cleaned symbol, the market row of its bar (-1 if not in the market) and its symbol's end row."""
+    codes, names = pd.factorize(signals['symbol'])
+    names = pd.Index(names).astype(str).str.strip().str.upper()
+    dates = pd.to_datetime(signals['date']).to_numpy(dtype='datetime64[ns]')
+    market_dates = market.columns['date']
+    rows = np.full(len(signals), -1, dtype=np.int64)
+    ends = np.zeros(len(signals), dtype=np.int64)
+    # Signals grouped by symbol, so each symbol is one slice of `order`
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+    for k, symbol in enumerate(names):
+        sel = order[bounds[k]:bounds[k + 1]]
+        span = market.rows(symbol)
+        found = span.start + np.searchsorted(market_dates[span], dates[sel])
+        hit = (found < span.stop) & (market_dates[np.minimum(found, len(market_dates) - 1)] == dates[sel])
+        rows[sel] = np.where(hit, found, -1)
+        ends[sel] = span.stop
+    return names.to_numpy()[codes], rows, ends
+
+
+def forward_outcomes(columns, rows, ends, direction, horizons=HORIZONS):
+    """Direction-signed outcomes of entries at the close of ``rows``.
+
+    ``columns`` holds the market's ``close``, ``high`` and ``low`` arrays and
+    ``ends`` the end row of each entry's symbol. Returns ``ret_N``, ``mfe_N``,
+    ``mae_N`` and ``hit_N`` arrays for every horizon ``N``.
+    """
+    close = columns['close'].astype(np.float64)
+    high = columns['high'].astype(np.float64)
+    low = columns['low'].astype(np.float64)
+    entry = close[rows]
+
+    # Highs/lows of the next `longest` bars of every entry, NaN past its symbol's end
+    longest = max(horizons)
+    pad = np.full(longest, np.nan)
+    ahead = rows[:, None] + 1 + np.arange(longest)
+    valid = ahead < ends[:, None]
+    highs = sliding_window_view(np.concatenate([high, pad]), longest)[np.minimum(rows + 1, len(high))]
+    lows = sliding_window_view(np.concatenate([low, pad]), longest)[np.minimum(rows + 1, len(low))]
+    highs = np.where(valid, highs, np.nan)
+    lows = np.where(valid, lows, np.nan)
+    up = np.fmax.accumulate(highs, axis=1) / entry[:, None] - 1
+    down = np.fmin.accumulate(lows, axis=1) / entry[:, None] - 1
+    bullish = (direction == 1)[:, None]
+    favorable = np.where(bullish, up, -down)
+    adverse = np.where(bullish, down, -up)
+
+    outcomes = {}
+    padded_close = np.concatenate([close, pad])
+    for n in horizons:
+        target = rows + n
+        inside = target < ends
+        forward = np.where(inside, padded_close[np.minimum(target, len(padded_close) - 1)] / entry - 1, np.nan)
+        ret = direction * forward
+        outcomes[f'ret_{n}'] = ret
+        outcomes[f'mfe_{n}'] = np.where(inside, favorable[:, n - 1], np.nan)
+        outcomes[f'mae_{n}'] = np.where(inside, adverse[:, n - 1], np.nan)
+        outcomes[f'hit_{n}'] = np.where(inside, ret > 0, np.nan)
+    return outcomes
+
+
+def signal_trades(market, signals, horizons=HORIZONS):
+    """One row per signal with its forward returns and excursions.
+
+    ``signals`` has ``symbol, date, tag`` columns (a batch signal table, the
+    signal index's events or ``detect_signals`` records). For each horizon
+    ``N`` the result has ``ret_N``, ``mfe_N`` (best move), ``mae_N`` (worst
+    move) and ``hit_N``; they are NaN where fewer than ``N`` bars follow.
+    Signals whose bar is not in ``market`` are dropped.
+    """
+    signals = pd.DataFrame(signals, columns=['symbol', 'date', 'tag'])
+    symbols, rows, ends = _signal_rows(market, signals)
+    keep = rows >= 0
+    rows, ends = rows[keep], ends[keep]
+    trades = pd.DataFrame({
+        'symbol': symbols[keep],
+        'date': pd.to_datetime(signals['date'].to_numpy()[keep]),
+        'tag': signals['tag'].to_numpy()[keep],
+    })
+    trades['sector'] = trades['symbol'].map(symbol_to_sector)
+    trades['direction'] = np.where(trades['tag'].isin(BEARISH_TAGS), -1, 1)
+
+    trades['entry'] = market.columns['close'][rows].astype(np.float64)
+    outcomes = forward_outcomes(market.columns, rows, ends, trades['direction'].to_numpy(), horizons)
+    for column, values in outcomes.items():
+        trades[column] = values
+    return trades
+
+
+def summarize(trades, by='tag', horizons=HORIZONS):
+    """Signal count, mean/median return, hit rate and mean excursions per group.
+
+    ``by`` is any of :data:`GROUPINGS` or a list of them.
+    """
+    columns = {'signals': ('entry', 'size')}
+    for n in horizons:
+        columns[f'avg_ret_{n}'] = (f'ret_{n}', 'mean')
+        columns[f'median_ret_{n}'] = (f'ret_{n}', 'median')
+        columns[f'hit_rate_{n}'] = (f'hit_{n}', 'mean')
+        columns[f'avg_mfe_{n}'] = (f'mfe_{n}', 'mean')
+        columns[f'avg_mae_{n}'] = (f'mae_{n}', 'mean')
+    summary = trades.groupby(by, sort=True, dropna=False).agg(**columns)
+    return summary.sort_values('signals', ascending=False, kind='stable')
+
+
+def backtest(market, signals, by='tag', horizons=HORIZONS):
+    """:func:`signal_trades` then :func:`summarize`."""
+    return summarize(signal_trades(market, signals, horizons), by, horizons)
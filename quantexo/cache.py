@@ -0,0 +1,44 @@
+"""Least-recently-used cache shared by the in-process memo layers."""
+import threading
+from collections import OrderedDict
+
+from quantexo.metrics import cache_hit, cache_miss
+
+
+class LRUCache:
+    """Thread-safe LRU of built values; lookups are counted under ``name``.
+
+    ``build`` runs outside the lock, so a slow build does not hold up
+    lookups of other keys. Two threads missing the same key both build it
+    and the later one is kept.
+    """
+
+    def __init__(self, name, maxsize):
+        self.name = name
+        self.maxsize = maxsize
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Cached value for ``key``, calling ``build()`` on a miss."""
+        with self._lock:
+            value = self._values.get(key)
+            if value is not None:
+                self._values.move_to_end(key)
+        if value is not None:
+            cache_hit(self.name)
+            return value
+        cache_miss(self.name)
+        value = build()
+        with self._lock:
+            self._values[key] = value
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def __len__(self):
+        return len(self._values)
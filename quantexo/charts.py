@@ -0,0 +1,228 @@
+"""Plotly figures for the dashboard.
+
+Long histories are not sent bar for bar. The price line carries a coarse
+LTTB overview of the whole history plus the bars of the visible range
+(downsampled only if that range is itself very long), and every signal bar
+is always kept so markers sit on the line. Traces are WebGL (``Scattergl``)
+and carry only the hover fields the line does not already have.
+"""
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from quantexo.cache import LRUCache
+from quantexo.signals import TAG_LABELS
+
+OVERVIEW_POINTS = 400  # line points for the whole history
+VIEW_POINTS = 1500  # line points for the visible range; ranges up to this size are sent in full
+DEFAULT_VIEW = pd.Timedelta(days=365)
+HOVER_COLUMNS = ['open', 'high', 'low', 'point_change']
+FIGURE_CACHE_SIZE = 64
+
+
+# --- Downsampling ---
+
+def lttb(x, y, n_out):
+    """Indices of ``n_out`` points picked by largest-triangle-three-buckets.
+
+    ``x`` and ``y`` are numeric arrays; the first and last points are kept.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # n_out - 2 buckets over the interior points; each is at least one point wide
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        following = slice(hi, edges[i + 2]) if i + 2 < len(edges) else slice(n - 1, n)
+        cx, cy = x[following].mean(), y[following].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def minmax(y, n_out):
+    """Indices of the lowest and highest point of ``n_out // 2`` equal buckets."""
+    n = len(y)
+    buckets = n_out // 2
+    if n_out >= n or buckets < 1:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    picked = [
+        i for lo, hi in zip(edges[:-1], edges[1:])
+        for i in (lo + int(np.argmin(y[lo:hi])), lo + int(np.argmax(y[lo:hi])))
+    ]
+    return np.unique(picked)
+
+
+def line_rows(dates, close, view, keep=None, method='lttb'):
+    """Rows of a date-sorted series to draw for a chart showing ``view``.
+
+    A coarse overview of the whole series, the ``view`` range in detail and
+    every row in ``keep``.
+    """
+    pick = lttb if method == 'lttb' else (lambda x, y, n: minmax(y, n))
+    x = dates.astype('datetime64[ns]').astype(np.int64)
+    rows = [pick(x, close, OVERVIEW_POINTS)]
+    inside = np.flatnonzero((dates >= np.datetime64(view[0])) & (dates <= np.datetime64(view[1])))
+    if len(inside):
+        rows.append(inside[pick(x[inside], close[inside], VIEW_POINTS)])
+    if keep is not None:
+        rows.append(np.asarray(keep, dtype=np.int64))
+    return np.unique(np.concatenate(rows))
+
+
+def default_view(df):
+    """The last year of ``df``, as the chart opens."""
+    last = df['date'].max()
+    return last - DEFAULT_VIEW, last
+
+
+# --- Figures ---
+
+def _day_labels(dates):
+    return pd.DatetimeIndex(dates).strftime('%Y-%m-%d')
+
+
+def price_chart(df, signals, company_symbol, view=None, method='lttb'):
+    """Close-price line of ``df`` with a marker trace per signal tag.
+
+    ``df`` is one symbol's date-sorted rows with ``point_change``;
+    ``signals`` its tagged bars (see :meth:`SignalIndex.for_symbol`).
+    ``view`` is the ``(start, end)`` date range shown at full detail
+    (default: the last year).
+    """
+    view = view or default_view(df)
+    dates = df['date'].to_numpy()
+    keep = np.flatnonzero(np.isin(dates, signals['date'].to_numpy()))
+    line = df.iloc[line_rows(dates, df['close'].to_numpy(), view, keep, method)]
+
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=_day_labels(line['date']), y=line['close'],
+        mode='lines', name='Close Price',
+        line=dict(color='lightblue', width=2),
+        customdata=line[HOVER_COLUMNS].to_numpy().round(2),
+        hovertemplate=(
+            "📅 Date: %{x|%Y-%m-%d}<br>" +
+            "🟢 Open: %{customdata[0]:.2f}<br>" +
+            "📈 High: %{customdata[1]:.2f}<br>" +
+            "📉 Low: %{customdata[2]:.2f}<br>" +
+            "💰 LTP: %{y:.2f}<br>" +
+            "📊 Point Change: %{customdata[3]:.2f}<extra></extra>"
+        )
+    ))
+
+    for tag in signals['tag'].unique():
+        subset = signals[signals['tag'] == tag]
+        fig.add_trace(go.Scattergl(
+            x=_day_labels(subset['date']), y=subset['close'],
+            mode='markers+text',
+            name=TAG_LABELS.get(tag, tag),
+            text=[tag] * len(subset),
+            textposition='top center',
+            textfont=dict(size=20),
+            marker=dict(size=14, symbol="circle", color='white'),
+            customdata=subset[HOVER_COLUMNS].to_numpy().round(2),
+            hovertemplate=(
+                "📅 Date: %{x|%Y-%m-%d}<br>" +
+                "🟢 Open: %{customdata[0]:.2f}<br>" +
+                "📈 High: %{customdata[1]:.2f}<br>" +
+                "📉 Low: %{customdata[2]:.2f}<br>" +
+                "🔚 Close: %{y:.2f}<br>" +
+                "📊 Point Change: %{customdata[3]:.2f}<br>" +
+                f"{TAG_LABELS.get(tag, tag)}<extra></extra>"
+            )
+        ))
+
+    # Leave 15 days of space after the end of the view
+    extended_date = pd.Timestamp(view[1]) + timedelta(days=15)
+    fig.update_layout(
+        height=800,
+        width=1800,
+        plot_bgcolor="darkslategray",
+        paper_bgcolor="darkslategray",
+        font_color="white",
+        xaxis=dict(title="Date", tickangle=-45, showgrid=False, range=[pd.Timestamp(view[0]), extended_date]),
+        yaxis=dict(title="Price", showgrid=False, zeroline=True, zerolinecolor="gray", autorange=True),
+        margin=dict(l=50, r=50, b=130, t=50),
+        legend=dict(
+            orientation="h",
+            yanchor="top",
+            y=-0.2,  # Adjust this value to move further down if needed
+            xanchor="center",
+            x=0.5,
+            font=dict(size=14),
+            bgcolor="rgba(0,0,0,0)"  # Optional: keeps legend background transparent
+        ),
+        # Add zoom and pan capabilities
+        dragmode="zoom",  # Enable box zoom
+        annotations=[
+            dict(
+                text=f"{company_symbol} <br> Quantexo",
+                xref="paper", yref="paper",
+                x=0.5, y=0.5,
+                xanchor="center", yanchor="middle",
+                font=dict(size=25, color="rgba(59, 59, 59)"),
+                showarrow=False
+            )
+        ]
+    )
+    fig.update_xaxes(
+        rangeselector=dict(
+            buttons=list([
+                dict(count=1, label="1m", step="month", stepmode="backward"),
+                dict(count=3, label="3m", step="month", stepmode="backward"),
+                dict(count=6, label="6m", step="month", stepmode="backward"),
+                dict(count=1, label="YTD", step="year", stepmode="todate"),
+                dict(count=1, label="1y", step="year", stepmode="backward"),
+                dict(step="all")
+            ])
+        )
+    )
+    return fig
+
+
+def sector_heatmap(matrix, title, midpoint=None):
+    """Heatmap of a sector x date table (see :func:`~quantexo.sector_analytics.sector_matrix`)."""
+    fig = go.Figure(go.Heatmap(
+        z=matrix.to_numpy(dtype=np.float64).round(3),
+        x=_day_labels(matrix.columns),
+        y=matrix.index,
+        colorscale='RdYlGn',
+        zmid=midpoint,
+        hovertemplate="%{y}<br>📅 %{x|%Y-%m-%d}<br>%{z}<extra>" + title + "</extra>"
+    ))
+    fig.update_layout(
+        height=200 + 40 * len(matrix),
+        plot_bgcolor="darkslategray",
+        paper_bgcolor="darkslategray",
+        font_color="white",
+        title=title,
+        xaxis=dict(title="Date", tickangle=-45),
+        margin=dict(l=50, r=50, b=100, t=60)
+    )
+    return fig
+
+
+# --- Cache ---
+
+class FigureCache(LRUCache):
+    """Built figures keyed by ``(symbol, data version, view range)``, least recently used first out.
+
+    Figures are kept as objects rather than JSON specs: Streamlit serialises
+    a figure cheaply but re-validates a spec, which costs more than a rebuild.
+    Cached figures are shared, so callers must not modify them.
+    """
+
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        super().__init__('figure', maxsize)
@@ -0,0 +1,144 @@
+"""Headless market scanner for scheduled (cron) runs.
+
+Loads the sheet (or a local export), scans it and writes the latest signal
+of every selected symbol, in the same layout as the dashboard's Scan All::
+
+    python -m quantexo --source prices.csv --output signals.csv
+    python -m quantexo --sector "Hydro Power" --format json --output -
+    python -m quantexo --engine process --workers 8 --output signals.parquet
+    python -m quantexo --output signals.csv --charts report/ --chart-format svg
+
+Exit status is 2 for usage errors (including an unknown ``--sector``), 1 when
+the data cannot be loaded and 0 otherwise.
+"""
+import argparse
+import os
+import sys
+
+from quantexo.data import SHEET_URL, load_market
+from quantexo.history import HistoryStore
+from quantexo.metrics import METRICS, timer
+from quantexo.report import FORMATS as CHART_FORMATS, export_charts
+from quantexo.scan import SCAN_LOOKBACK, scan_market, scan_market_batch
+from quantexo.sectors import all_companies, sector_to_companies
+from quantexo.signal_index import SignalIndex, scan_table
+
+FORMATS = ('csv', 'parquet', 'json')
+ENGINES = ('batch', 'process', 'thread', 'serial')
+
+
+def select_symbols(market, symbols=None, sectors=None, every_symbol=False):
+    """Symbols to scan: explicit ones and/or whole sectors, else the listed companies."""
+    if symbols or sectors:
+        chosen = [s.strip().upper() for s in symbols or []]
+        by_name = {name.lower(): companies for name, companies in sector_to_companies.items()}
+        for sector in sectors or []:
+            if sector.lower() not in by_name:
+                raise ValueError(f"unknown sector {sector!r}; choose from {', '.join(sector_to_companies)}")
+            chosen.extend(by_name[sector.lower()])
+        return list(dict.fromkeys(chosen))
+    return list(market.symbols) if every_symbol else list(all_companies)
+
+
+def write_results(df, output, fmt):
+    if fmt == 'parquet':
+        if output == '-':
+            raise ValueError("parquet output needs a file path")
+        df.to_parquet(output, index=False)
+    elif fmt == 'json':
+        text = df.to_json(orient='records', force_ascii=False, indent=1)
+        if output == '-':
+            sys.stdout.write(text + '\n')
+        else:
+            with open(output, 'w', encoding='utf-8') as f:
+                f.write(text)
+    else:
+        df.to_csv(sys.stdout if output == '-' else output, index=False)
+
+
+def output_format(output, fmt=None):
+    """Explicit ``fmt``, else the output file's extension, else CSV."""
+    if fmt:
+        return fmt
+    ext = os.path.splitext(output)[1].lower().lstrip('.')
+    return {'pq': 'parquet'}.get(ext, ext) if ext in FORMATS + ('pq',) else 'csv'
+
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, not {text}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m quantexo', description="Scan the NEPSE market for smart-money signals.")
+    parser.add_argument('--source', default=os.environ.get('QUANTEXO_DATA', SHEET_URL),
+                        help="sheet URL or local CSV/Parquet export (default: $QUANTEXO_DATA or the live sheet)")
+    parser.add_argument('--history-dir', default=os.environ.get('QUANTEXO_HISTORY_DIR'),
+                        help="on-disk history store to refresh and scan from")
+    parser.add_argument('--output', '-o', default='-', help="output file, '-' for stdout (default)")
+    parser.add_argument('--format', '-f', choices=FORMATS, help="output format (default: from the output extension, else csv)")
+    parser.add_argument('--symbol', '-s', action='append', dest='symbols', help="symbol to scan (repeatable)")
+    parser.add_argument('--sector', action='append', dest='sectors', help="sector to scan (repeatable)")
+    parser.add_argument('--all', action='store_true', dest='every_symbol',
+                        help="scan every symbol in the data, not just the listed companies (not with --symbol/--sector)")
+    parser.add_argument('--engine', choices=ENGINES, default='batch',
+                        help="batch (one columnar pass, default) or the per-symbol pipeline on a pool")
+    parser.add_argument('--workers', '-j', type=positive_int, help="pool size for the process/thread engines")
+    parser.add_argument('--lookback', type=positive_int, default=SCAN_LOOKBACK, help="bars scanned per symbol")
+    parser.add_argument('--charts', metavar='DIR', help="also render a chart of every symbol with a signal into DIR")
+    parser.add_argument('--chart-format', choices=CHART_FORMATS, default='png')
+    parser.add_argument('--metrics', help="write stage timings as JSON to this file")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.every_symbol and (args.symbols or args.sectors):
+        parser.error("--all cannot be combined with --symbol or --sector")
+    fmt = output_format(args.output, args.format)
+    if fmt == 'parquet' and args.output == '-':
+        parser.error("parquet output needs --output FILE")
+
+    try:
+        if args.history_dir:
+            store = HistoryStore(args.history_dir)
+            store.refresh(args.source)
+            market = store.load_market()
+        else:
+            market = load_market(args.source)
+    except Exception as e:
+        print(f"error: could not load {args.source}: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        symbols = select_symbols(market, args.symbols, args.sectors, args.every_symbol)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    def report_error(symbol, message):
+        print(f"warning: {symbol}: {message}", file=sys.stderr)
+
+    if args.engine == 'batch':
+        results = scan_market_batch(market, symbols, args.lookback)
+    else:
+        results = scan_market(market, symbols, workers=args.workers, executor=args.engine,
+                              on_error=report_error, lookback=args.lookback)
+    write_results(scan_table(results), args.output, fmt)
+
+    if args.charts:
+        charted = results['symbol'].tolist()
+        with timer('export_charts', rows=len(results)):
+            # Markers for the charted symbols only; the full index would tag the whole market
+            index = SignalIndex.for_symbols(market, charted)
+            paths = export_charts(market, index, charted, args.charts, args.chart_format, args.workers)
+        print(f"wrote {len(paths)} charts to {args.charts}", file=sys.stderr)
+
+    if args.metrics:
+        with open(args.metrics, 'w') as f:
+            f.write(METRICS.to_json(indent=1))
+    print(f"scanned {len(symbols)} symbols from {len(market)} rows: {len(results)} signals", file=sys.stderr)
+    return 0
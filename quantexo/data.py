@@ -0,0 +1,278 @@
+"""Market-wide data layer.
+
+The price sheet holds every NEPSE symbol in one long table, so it is fetched
+and parsed once per refresh and per-symbol frames are handed out as slices.
+Ingest types every column in a single pass and keeps the rows it rejects.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from quantexo.fetch import NotModified, fetch_csv_sync
+from quantexo.metrics import cache_hit, cache_miss, timer
+
+SHEET_URL = "https://docs.google.com/spreadsheets/d/1Q_En7VGGfifDmn5xuiF-t_02doPpwl4PLzxb4TBCW0Q/export?format=csv&gid=0"  # Using gid=0 for the first sheet
+COLUMNS = ['date', 'symbol', 'open', 'high', 'low', 'close', 'volume']
+NUMERIC_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+# --- Data Sources ---
+
+class SheetSource:
+    """Google Sheets CSV export (the live NEPSE sheet by default).
+
+    Downloads go through :mod:`quantexo.fetch` (timeouts, retries, streamed
+    parsing). The source remembers the validators of its last download, so
+    reading an unchanged sheet again raises :class:`NotModified`; call
+    :meth:`forget` when a downloaded frame could not be used.
+    """
+
+    def __init__(self, url=SHEET_URL, **fetch_options):
+        self.url = url
+        self.fetch_options = fetch_options
+        self.etag = None
+        self.last_modified = None
+
+    def read(self, **options):
+        fetched = fetch_csv_sync(self.url, options, etag=self.etag, last_modified=self.last_modified,
+                                 **self.fetch_options)
+        if fetched.frame is None:
+            cache_hit('sheet')
+            raise NotModified(self.url)
+        cache_miss('sheet')
+        self.etag, self.last_modified = fetched.etag, fetched.last_modified
+        return fetched.frame
+
+    def forget(self):
+        """Drop the saved validators so the next read downloads the sheet again."""
+        self.etag = self.last_modified = None
+
+    def __repr__(self):
+        return f"SheetSource({self.url!r})"
+
+
+class FileSource:
+    """Local CSV or Parquet file laid out like the sheet, for offline use."""
+
+    def __init__(self, path):
+        self.path = str(path)
+
+    def read(self, **options):
+        """Read the file; ``options`` are passed to ``read_csv`` only."""
+        if self.path.lower().endswith(('.parquet', '.pq')):
+            return pd.read_parquet(self.path)
+        return pd.read_csv(self.path, **options)
+
+    def __repr__(self):
+        return f"FileSource({self.path!r})"
+
+
+def make_source(source=None):
+    """Turn a URL, a file path or an existing source object into a source."""
+    if source is None:
+        return SheetSource()
+    if hasattr(source, 'read'):
+        return source
+    if str(source).startswith(('http://', 'https://')):
+        return SheetSource(str(source))
+    return FileSource(source)
+
+
+# --- Market Frame ---
+
+class MarketData:
+    """Whole-market price history in a compact, symbol-indexed layout.
+
+    Rows are grouped by symbol (dates ascending) and each column is one
+    contiguous, read-only NumPy array. ``offsets[i]:offsets[i + 1]`` are the
+    rows of ``symbols[i]``, so a symbol's history is a slice found with a
+    dict lookup. ``rejected`` keeps the raw rows ingest could not use.
+    """
+
+    def __init__(self, symbols, offsets, columns, rejected=None):
+        self.symbols = list(symbols)
+        self.offsets = _frozen(np.asarray(offsets, dtype=np.int64))
+        self.columns = {col: _frozen(values) for col, values in columns.items()}
+        self.rejected = pd.DataFrame(columns=COLUMNS + ['reason']) if rejected is None else rejected
+        self._position = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._rejected_rows = None
+
+    @classmethod
+    def from_frame(cls, df, rejected=None):
+        """Build from a long frame with the sheet's (typed) columns."""
+        df = df.sort_values(['symbol', 'date'], kind='stable')
+        symbols, counts = np.unique(df['symbol'].to_numpy(dtype=object), return_counts=True)
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        columns = {col: df[col].to_numpy() for col in COLUMNS if col != 'symbol'}
+        return cls(symbols, offsets, columns, rejected)
+
+    @classmethod
+    def empty(cls):
+        columns = {'date': np.array([], dtype='datetime64[ns]')}
+        columns.update((col, np.array([], dtype=PRICE_DTYPE)) for col in NUMERIC_COLUMNS)
+        columns['volume'] = np.array([], dtype=VOLUME_DTYPE)
+        return cls([], [0], columns)
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in self.columns.values()) + self.offsets.nbytes
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def __contains__(self, symbol):
+        return str(symbol).strip().upper() in self._position
+
+    def rows(self, symbol):
+        """Row slice of one symbol (empty if unknown)."""
+        i = self._position.get(str(symbol).strip().upper())
+        if i is None:
+            return slice(0, 0)
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def arrays(self, symbol):
+        """Read-only column views of one symbol, without building a frame."""
+        rows = self.rows(symbol)
+        return {col: values[rows] for col, values in self.columns.items()}
+
+    def rejected_rows(self, symbol):
+        """Raw rows of ``symbol`` that ingest rejected (grouped once, on first use)."""
+        if self._rejected_rows is None:
+            keys = self.rejected['symbol'].astype(str).str.strip().str.upper()
+            self._rejected_rows = keys.groupby(keys, sort=False).indices
+        rows = self._rejected_rows.get(str(symbol).strip().upper())
+        return self.rejected.iloc[0:0] if rows is None else self.rejected.iloc[rows]
+
+    def get(self, symbol):
+        """One symbol's rows, date-sorted, with the sheet's column layout."""
+        symbol = str(symbol).strip().upper()
+        rows = self.rows(symbol)
+        df = {col: self.columns[col][rows] for col in COLUMNS if col != 'symbol'}
+        df['symbol'] = symbol
+        return pd.DataFrame(df, columns=COLUMNS)
+
+    def to_frame(self, symbols=None, tail=None):
+        """Long-format frame of every symbol (or just ``symbols``).
+
+        ``tail`` keeps only each symbol's last ``tail`` rows.
+        """
+        if symbols is None:
+            picked = range(len(self.symbols))
+        else:
+            wanted = {str(s).strip().upper() for s in symbols}
+            picked = [self._position[s] for s in sorted(wanted) if s in self._position]
+        ends = self.offsets[1:]
+        starts = self.offsets[:-1] if tail is None else np.maximum(self.offsets[:-1], ends - tail)
+        spans = [np.arange(starts[i], ends[i]) for i in picked]
+        take = np.concatenate(spans) if spans else np.array([], dtype=np.int64)
+        counts = [len(span) for span in spans]
+        df = {col: values[take] for col, values in self.columns.items()}
+        # Symbol strings are shared objects, not one copy per row
+        df['symbol'] = np.repeat(np.array([self.symbols[i] for i in picked], dtype=object), counts)
+        return pd.DataFrame(df, columns=COLUMNS)
+
+
+def _frozen(values):
+    values = np.ascontiguousarray(values)
+    values.flags.writeable = False
+    return values
+
+
+# --- Ingest ---
+
+DATE_FORMAT = '%Y-%m-%d'
+# Prices stay float64: float32 would save ~1MB on a year of market data but
+# shifts the close-near-high/low and body-ratio comparisons at their edges
+PRICE_DTYPE = np.float64
+# Volume is a share count; rows with fractional volume are rejected rather than widening the column
+VOLUME_DTYPE = np.int64
+# Parse the raw export straight into typed columns with the C parser
+CSV_OPTIONS = dict(
+    header=0, names=COLUMNS, usecols=range(len(COLUMNS)),
+    dtype={'date': 'category', 'symbol': 'category'}, thousands=',', skipinitialspace=True
+)
+
+
+class Ingested(NamedTuple):
+    prices: pd.DataFrame  # typed rows that passed every check
+    rejected: pd.DataFrame  # raw rows that did not, with a ``reason`` column
+
+
+def _per_category(values, parse):
+    """Run ``parse`` once per distinct value of a categorical column."""
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        return parse(values)
+    # Dates and symbols repeat across ~300 symbols; unseen codes (-1) become NA
+    parsed = parse(pd.Series(values.cat.categories.astype(object)))
+    return parsed.reindex(values.cat.codes.to_numpy()).set_axis(values.index)
+
+
+def _parse_symbols(values):
+    return values.astype(str).str.strip().str.upper().where(values.notna())
+
+
+def _parse_dates(values, date_format):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    dates = pd.to_datetime(values, format=date_format, errors='coerce')
+    # Only rows off the fixed format pay for format inference
+    retry = dates.isna() & values.notna()
+    if retry.any():
+        dates[retry] = pd.to_datetime(values[retry], format='mixed', errors='coerce')
+    return dates
+
+
+def _parse_numbers(values):
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(np.float64)
+    numbers = pd.to_numeric(values, errors='coerce')
+    # Strip currency marks, spaces and other noise only where plain parsing failed
+    retry = numbers.isna() & values.notna()
+    if retry.any():
+        numbers[retry] = pd.to_numeric(values[retry].astype(str).str.replace(r'[^\d.]', '', regex=True), errors='coerce')
+    return numbers
+
+
+def ingest_frame(df, date_format=DATE_FORMAT):
+    """Type a raw sheet frame and split off the rows that cannot be used."""
+    raw = df.iloc[:, :7].set_axis(COLUMNS, axis=1)
+    parsed = {
+        'date': _per_category(raw['date'], lambda values: _parse_dates(values, date_format)),
+        'symbol': _per_category(raw['symbol'], _parse_symbols),
+    }
+    parsed.update((col, _parse_numbers(raw[col])) for col in NUMERIC_COLUMNS)
+
+    problems = {col: values.isna() for col, values in parsed.items()}
+    problems['symbol'] |= parsed['symbol'] == ''
+    problems['volume'] |= parsed['volume'] != np.floor(parsed['volume'])
+    bad = np.logical_or.reduce(list(problems.values()))
+
+    prices = pd.DataFrame({col: values[~bad] for col, values in parsed.items()})[COLUMNS]
+    for col in ('open', 'high', 'low', 'close'):
+        prices[col] = prices[col].astype(PRICE_DTYPE)
+    prices['volume'] = prices['volume'].astype(VOLUME_DTYPE)
+    prices = prices.reset_index(drop=True)
+
+    rejected = raw[bad].copy()
+    rejected['reason'] = [
+        ', '.join(col for col in COLUMNS if problems[col].iat[i]) for i in np.flatnonzero(bad)
+    ]
+    return Ingested(prices, rejected)
+
+
+def read_prices(source=None, date_format=DATE_FORMAT):
+    """Fetch a source and ingest it in one pass."""
+    source = make_source(source)
+    with timer('fetch') as span:
+        raw = source.read(**CSV_OPTIONS)
+        span.rows = len(raw)
+    with timer('ingest', rows=len(raw)):
+        return ingest_frame(raw, date_format)
+
+
+def load_market(source=None):
+    """Fetch the sheet once and return it as a MarketData keyed by symbol."""
+    prices, rejected = read_prices(source)
+    with timer('market_build', rows=len(prices)):
+        return MarketData.from_frame(prices, rejected)
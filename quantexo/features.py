@@ -0,0 +1,172 @@
+"""Memoised per-bar features shared by the signal rules, charts and indicators.
+
+:class:`Features` wraps the OHLCV arrays of one symbol, or of many stacked
+back to back and split by ``starts``, and computes each derived series the
+first time it is asked for. :class:`FeatureStore` keeps the features of
+recently used symbols of one data version, least recently used first out.
+"""
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from quantexo.cache import LRUCache
+
+FEATURE_CACHE_SIZE = 128
+OHLCV = ('open', 'high', 'low', 'close', 'volume')
+
+
+def segment_layout(n, starts=None):
+    """Per-row symbol number, position within the symbol and symbol length."""
+    starts = np.zeros(1 if n else 0, dtype=np.int64) if starts is None else np.asarray(starts, dtype=np.int64)
+    lengths = np.diff(np.append(starts, n))
+    group = np.repeat(np.arange(len(starts)), lengths)
+    return group, np.arange(n) - starts[group], lengths[group]
+
+
+class Features:
+    """Derived series of one OHLCV block, computed on first use."""
+
+    def __init__(self, open_, high, low, close, volume, starts=None):
+        self.open = np.asarray(open_)
+        self.high = np.asarray(high)
+        self.low = np.asarray(low)
+        self.close = np.asarray(close)
+        self.volume = np.asarray(volume)
+        self.n = len(self.close)
+        if starts is None:
+            starts = np.zeros(1 if self.n else 0, dtype=np.int64)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self._memo = {}
+
+    @classmethod
+    def from_columns(cls, columns, starts=None):
+        """From a mapping of OHLCV arrays (a frame, or ``MarketData.arrays``)."""
+        return cls(*(np.asarray(columns[col]) for col in OHLCV), starts=starts)
+
+    def _cached(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    # --- Layout ---
+
+    @cached_property
+    def _layout(self):
+        return segment_layout(self.n, self.starts)
+
+    @property
+    def group(self):
+        return self._layout[0]
+
+    @property
+    def position(self):
+        """Bar number within its symbol."""
+        return self._layout[1]
+
+    @property
+    def length(self):
+        """Bar count of each bar's symbol."""
+        return self._layout[2]
+
+    # --- Candles ---
+
+    @cached_property
+    def bull(self):
+        return self.close > self.open
+
+    @cached_property
+    def bear(self):
+        return self.open > self.close
+
+    @cached_property
+    def body(self):
+        return np.abs(self.close - self.open)
+
+    @cached_property
+    def candle_range(self):
+        return self.high - self.low
+
+    @cached_property
+    def prev_body(self):
+        """Body of the previous bar; like ``iloc[i - 1]`` at 0, a first bar gets its symbol's last."""
+        prev_body = np.roll(self.body, 1)
+        first = np.flatnonzero(self.position == 0)
+        prev_body[first] = self.body[first + self.length[first] - 1]
+        return prev_body
+
+    @cached_property
+    def close_position(self):
+        """Where the close sits in the bar's range (0 = low, 1 = high; NaN for a flat bar)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.candle_range > 0, (self.close - self.low) / self.candle_range, np.nan)
+
+    @cached_property
+    def point_change(self):
+        """Close-to-close change, 0 on each symbol's first bar."""
+        change = np.diff(self.close, prepend=np.nan).astype(np.float64)
+        change[self.starts] = 0
+        return change
+
+    # --- Rolling windows ---
+
+    def volume_mean(self, window=20, min_window=5):
+        """Rolling average volume over ``min(window, max(min_window, length // 2))`` bars.
+
+        Back-filled over the warm-up; symbols shorter than their window get
+        their own mean.
+        """
+        return self._cached(('volume_mean', window, min_window),
+                            lambda: self._volume_mean(window, min_window))
+
+    def _volume_mean(self, window, min_window):
+        if len(self.starts) <= 1:
+            volume = pd.Series(self.volume)
+            w = min(window, max(min_window, self.n // 2))
+            return volume.rolling(window=w).mean().bfill().fillna(volume.mean()).to_numpy()
+
+        volume = pd.Series(self.volume)
+        group, length = self.group, self.length
+        windows = np.minimum(window, np.maximum(min_window, length // 2))
+        avg_volume = np.empty(self.n)
+        # Symbols sharing a window length are rolled together in one grouped pass
+        for w in np.unique(windows):
+            sel = windows == w
+            part = volume[sel].reset_index(drop=True)
+            keys = group[sel]
+            rolled = part.groupby(keys).rolling(window=w).mean().to_numpy()
+            avg_volume[sel] = pd.Series(rolled).groupby(keys).bfill().to_numpy()
+        for g in np.unique(group[np.isnan(avg_volume)]):
+            rows = slice(self.starts[g], self.starts[g] + length[self.starts[g]])
+            avg_volume[rows] = np.where(np.isnan(avg_volume[rows]), volume[rows].mean(), avg_volume[rows])
+        return avg_volume
+
+    def prior_high(self, lookback):
+        """Highest high of the ``lookback`` bars before each bar (NaN over the first ``lookback`` bars)."""
+        return self._cached(('prior_high', lookback), lambda: self._prior(self.high, lookback, 'max'))
+
+    def prior_low(self, lookback):
+        """Lowest low of the ``lookback`` bars before each bar."""
+        return self._cached(('prior_low', lookback), lambda: self._prior(self.low, lookback, 'min'))
+
+    def _prior(self, values, lookback, how):
+        rolled = getattr(pd.Series(values).rolling(lookback), how)().shift(1).to_numpy()
+        # Windows reaching back into the previous symbol are not valid
+        return np.where(self.position >= lookback, rolled, np.nan)
+
+
+class FeatureStore:
+    """Features of recently used symbols of one dataset, keyed by symbol and data version."""
+
+    def __init__(self, market, version=None, maxsize=FEATURE_CACHE_SIZE):
+        self.market = market
+        self.version = version
+        self._features = LRUCache('features', maxsize)
+
+    def get(self, symbol):
+        """Features of one symbol's rows (the same rows ``market.get`` returns)."""
+        symbol = str(symbol).strip().upper()
+        return self._features.get((symbol, self.version), lambda: Features.from_columns(self.market.arrays(symbol)))
+
+    def __len__(self):
+        return len(self._features)
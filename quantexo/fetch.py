@@ -0,0 +1,142 @@
+"""Asynchronous CSV download with timeouts, retries and conditional requests.
+
+:func:`fetch_csv` streams the response body in chunks straight into
+``pd.read_csv`` running on a worker thread, so parsing overlaps the
+download. Connect and per-read timeouts bound a stalled upstream, transient
+failures (network errors, timeouts, 429/5xx) are retried with jittered
+exponential backoff, and the ETag/Last-Modified validators of the previous
+download turn an unchanged sheet into a cheap 304. aiohttp is imported on
+the first download, so processes reading local exports never load it.
+"""
+import asyncio
+import io
+import queue
+import random
+from typing import NamedTuple
+
+import pandas as pd
+
+CHUNK_SIZE = 64 * 1024
+CONNECT_TIMEOUT = 10  # seconds
+READ_TIMEOUT = 30  # seconds without a byte from the server
+TOTAL_TIMEOUT = 180
+RETRIES = 3
+BACKOFF = 1.0  # seconds before the first retry, doubled for each later one
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """The download failed for good (retries exhausted or a non-retryable status)."""
+
+
+class NotModified(Exception):
+    """The server answered 304: nothing changed since the last download."""
+
+
+class Fetched(NamedTuple):
+    frame: pd.DataFrame  # None when the server answered 304
+    etag: str
+    last_modified: str
+    attempts: int
+
+
+class _ChunkReader(io.RawIOBase):
+    """Blocking file object over chunks pushed from the event loop."""
+
+    def __init__(self):
+        self._chunks = queue.SimpleQueue()
+        self._buffer = b''
+        self._done = False
+
+    def feed(self, chunk):
+        self._chunks.put(chunk)
+
+    def close_feed(self, error=None):
+        self._chunks.put(error)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._buffer and not self._done:
+            item = self._chunks.get()
+            if isinstance(item, BaseException):
+                raise item
+            if item is None:
+                self._done = True
+            else:
+                self._buffer = item
+        n = min(len(buffer), len(self._buffer))
+        buffer[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+async def _attempt(session, url, headers, read_options):
+    """One request; returns (frame or None, response headers)."""
+    async with session.get(url, headers=headers) as response:
+        if response.status == 304:
+            return None, response.headers
+        if response.status != 200:
+            error = FetchError(f"HTTP {response.status} from {url}")
+            error.status = response.status
+            raise error
+
+        reader = _ChunkReader()
+        loop = asyncio.get_running_loop()
+        parsing = loop.run_in_executor(None, lambda: pd.read_csv(io.BufferedReader(reader), **read_options))
+        try:
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                reader.feed(chunk)
+        except BaseException as e:
+            reader.close_feed(FetchError(f"download interrupted: {e!r}"))
+            await asyncio.gather(parsing, return_exceptions=True)
+            raise
+        reader.close_feed()
+        return await parsing, response.headers
+
+
+def _retryable(error):
+    import aiohttp
+
+    if isinstance(error, FetchError):
+        return getattr(error, 'status', None) in RETRY_STATUS
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+async def fetch_csv(url, read_options=None, etag=None, last_modified=None, retries=RETRIES,
+                    backoff=BACKOFF, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                    total_timeout=TOTAL_TIMEOUT):
+    """Download ``url`` and parse it with ``pd.read_csv(**read_options)``.
+
+    Pass the validators of the previous :class:`Fetched` as ``etag`` /
+    ``last_modified`` to skip an unchanged file (``frame`` is then None).
+    Raises :class:`FetchError` once ``retries`` retries have failed.
+    """
+    import aiohttp
+
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    timeout = aiohttp.ClientTimeout(total=total_timeout, sock_connect=connect_timeout, sock_read=read_timeout)
+
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        for attempt in range(retries + 1):
+            try:
+                frame, response_headers = await _attempt(session, url, headers, read_options or {})
+            except Exception as e:
+                if attempt == retries or not _retryable(e):
+                    if isinstance(e, FetchError):
+                        raise
+                    raise FetchError(f"fetching {url} failed after {attempt + 1} attempts: {e!r}") from e
+                await asyncio.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.0))
+                continue
+            return Fetched(frame, response_headers.get('ETag', etag),
+                           response_headers.get('Last-Modified', last_modified), attempt + 1)
+
+
+def fetch_csv_sync(url, read_options=None, **options):
+    """:func:`fetch_csv` for callers outside an event loop."""
+    return asyncio.run(fetch_csv(url, read_options, **options))
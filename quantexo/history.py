@@ -0,0 +1,174 @@
+"""On-disk price history with delta refresh.
+
+Cleaned OHLCV rows live in one Parquet file per symbol under ``root``, next
+to a small JSON manifest recording each symbol's last stored date. A refresh
+still reads the whole sheet (the export has no incremental API) but only
+writes the rows newer than what is on disk, and single-symbol
+reads open one memory-mapped file with just the requested columns.
+Writers hold a lock file, so several processes can refresh one store.
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+from urllib.parse import quote
+
+import pandas as pd
+
+from quantexo.data import COLUMNS, MarketData, read_prices
+from quantexo.metrics import timer
+
+MANIFEST = '_manifest.json'
+LOCK = '_manifest.lock'
+# A lock held longer than this was left by a writer that crashed
+LOCK_TIMEOUT = 120
+
+
+class HistoryStore:
+    """Cleaned OHLCV history, one Parquet file per symbol."""
+
+    def __init__(self, root):
+        self.root = str(root)
+        os.makedirs(self.root, exist_ok=True)
+        self._manifest = self._read_manifest()
+        self.rejected = None
+
+    # --- Manifest ---
+
+    def _read_manifest(self):
+        path = os.path.join(self.root, MANIFEST)
+        if not os.path.exists(path):
+            return {'revision': 0, 'last_dates': {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_manifest(self):
+        path = os.path.join(self.root, MANIFEST)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self._manifest, f, indent=1, sort_keys=True)
+        os.replace(path + '.tmp', path)
+
+    @contextmanager
+    def _locked(self):
+        """Hold the store's lock file; writers in other processes wait for it."""
+        path = os.path.join(self.root, LOCK)
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while True:
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                if time.monotonic() > deadline:
+                    # Left behind by a writer that crashed; take it over
+                    deadline = time.monotonic() + LOCK_TIMEOUT
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                    continue
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            os.remove(path)
+
+    @property
+    def version(self):
+        """Bumped every time rows are added; use it to key caches."""
+        return self._manifest['revision']
+
+    @property
+    def symbols(self):
+        return sorted(self._manifest['last_dates'])
+
+    def last_date(self, symbol=None):
+        """Last stored date of ``symbol``, or of the whole store."""
+        dates = self._manifest['last_dates']
+        if symbol is not None:
+            value = dates.get(symbol)
+        else:
+            value = max(dates.values(), default=None)
+        return pd.Timestamp(value) if value else None
+
+    def _path(self, symbol):
+        return os.path.join(self.root, quote(symbol, safe='') + '.parquet')
+
+    # --- Writes ---
+
+    def append(self, df):
+        """Store cleaned rows newer than each symbol's last stored date.
+
+        Returns the number of rows written.
+        """
+        with self._locked():
+            # Another store on this directory may have written since we read it
+            self._manifest = self._read_manifest()
+            last_dates = self._manifest['last_dates']
+            known = pd.to_datetime(df['symbol'].map(last_dates))
+            new = df[known.isna() | (df['date'] > known)]
+            if new.empty:
+                return 0
+
+            written = 0
+            for symbol, rows in new.groupby('symbol', sort=False):
+                fresh = rows[COLUMNS].sort_values('date', kind='stable')
+                path = self._path(symbol)
+                if os.path.exists(path):
+                    rows = pd.read_parquet(path)
+                    # The file can be ahead of the manifest after a crash between the two writes
+                    fresh = fresh[fresh['date'] > rows['date'].max()]
+                    if len(fresh):
+                        rows = pd.concat([rows, fresh], ignore_index=True)
+                else:
+                    rows = fresh
+                if len(fresh):
+                    rows.to_parquet(path + '.tmp', index=False)
+                    os.replace(path + '.tmp', path)
+                    written += len(fresh)
+                last_dates[symbol] = rows['date'].max().strftime('%Y-%m-%d')
+
+            if written:
+                self._manifest['revision'] += 1
+            self._write_manifest()
+            return written
+
+    def refresh(self, source=None):
+        """Pull the source and append only rows past the stored dates.
+
+        Rows ingest rejected are left in ``self.rejected``.
+        """
+        prices, self.rejected = read_prices(source)
+        with timer('history_append') as span:
+            span.rows = self.append(prices)
+        return span.rows
+
+    # --- Reads ---
+
+    def read(self, symbol, columns=None):
+        """One symbol's history (memory-mapped, only ``columns`` if given)."""
+        import pyarrow.parquet as pq
+
+        path = self._path(str(symbol).strip().upper())
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=columns or COLUMNS)
+        return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+    def read_market(self, columns=None, symbols=None):
+        """Long-format frame of every stored symbol (or just ``symbols``)."""
+        if symbols is None:
+            symbols = self.symbols
+        frames = [self.read(symbol, columns) for symbol in symbols]
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=columns or COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def load_market(self):
+        with timer('history_load') as span:
+            prices = self.read_market()
+            span.rows = len(prices)
+            return MarketData.from_frame(prices, self.rejected)
+
+    def __repr__(self):
+        return f"HistoryStore({self.root!r})"
+
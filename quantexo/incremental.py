@@ -0,0 +1,184 @@
+"""Incremental end-of-day signal updates.
+
+A :class:`SymbolState` keeps just enough of a symbol's history to tag the
+next bar exactly as a full :func:`~quantexo.signals.detect_signals` rerun
+would: the 20-bar volume window, the last 10 highs/lows, the cooldown and
+absorption-mark state, and any absorption trigger still waiting for its
+follow-through bar. Appending a bar is O(1). Thresholds and windows are
+those of :data:`~quantexo.signals.DEFAULT_PARAMS`.
+
+Until a symbol has :data:`WARM_BARS` bars the volume window still depends on
+the history length, so short histories are simply recomputed in full.
+"""
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from quantexo.data import COLUMNS
+from quantexo.features import Features
+from quantexo.signals import DEFAULT_PARAMS, TagReplay, resolve_tags, signal_masks
+
+VOLUME_WINDOW = DEFAULT_PARAMS.volume_window
+# min(20, max(5, n // 2)) settles at 20 once there are 40 bars, and the
+# breakout window must be full
+WARM_BARS = max(2 * VOLUME_WINDOW, DEFAULT_PARAMS.breakout_lookback)
+BAR_FIELDS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+
+class SymbolState:
+    """Rolling detector state of one symbol."""
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.n = 0
+        self.last_date = None
+        self.last_close = None
+        self.prev_body = None
+        self.volumes = deque(maxlen=VOLUME_WINDOW)
+        self.highs = deque(maxlen=DEFAULT_PARAMS.breakout_lookback)
+        self.lows = deque(maxlen=DEFAULT_PARAMS.breakout_lookback)
+        self.replay = TagReplay(DEFAULT_PARAMS.cooldown)
+        # (trigger row, trigger open) of absorption triggers still inside their look-ahead
+        self.watches = {'⛔': None, '🚀': None}
+        self.history = []  # bars kept only until the state is warm
+
+    @classmethod
+    def from_history(cls, symbol, df):
+        """State after tagging ``df`` (cleaned, date-sorted) in full."""
+        state = cls(symbol)
+        state._rebuild(list(df[BAR_FIELDS].itertuples(index=False, name=None)))
+        return state
+
+    @property
+    def marks(self):
+        """Rows currently holding the ⛔ and 🚀 marks (-1 for none)."""
+        return {'⛔': self.replay.bull_at, '🚀': self.replay.bear_at}
+
+    def _rebuild(self, bars):
+        """Full recompute over ``bars``; returns the tag of the last bar."""
+        self.__init__(self.symbol)
+        if not bars:
+            return ''
+        df = pd.DataFrame(bars, columns=BAR_FIELDS)
+        masks = signal_masks(Features.from_columns(df), DEFAULT_PARAMS)
+        placed, final = resolve_tags(masks, params=DEFAULT_PARAMS)
+
+        n = len(df)
+        self.n = n
+        self.last_date = bars[-1][0]
+        self.last_close = bars[-1][4]
+        self.prev_body = abs(bars[-1][4] - bars[-1][1])
+        self.volumes.extend(df['volume'].tolist())
+        self.highs.extend(df['high'].tolist())
+        self.lows.extend(df['low'].tolist())
+        for i, tag in placed:
+            if tag in self.replay.last:
+                self.replay.last[tag] = i
+        self.replay.bull_at = int(np.flatnonzero(final == '⛔')[0]) if (final == '⛔').any() else -1
+        self.replay.bear_at = int(np.flatnonzero(final == '🚀')[0]) if (final == '🚀').any() else -1
+        # Only the latest trigger of each kind can still place a mark
+        for tag, trigger, target in (('⛔', 'bull_trigger', 'bull_target'), ('🚀', 'bear_trigger', 'bear_target')):
+            rows = np.flatnonzero(masks[trigger])
+            if len(rows) and rows[-1] + DEFAULT_PARAMS.absorption_lookahead >= n and masks[target][rows[-1]] == -1:
+                self.watches[tag] = (int(rows[-1]), bars[rows[-1]][1])
+        if n < WARM_BARS:
+            self.history = list(bars)
+        return placed[-1][1] if placed and placed[-1][0] == n - 1 else ''
+
+    def update(self, date, open_, high, low, close, volume):
+        """Append one bar and return the tag it gets ('' for none).
+
+        Bars dated on or before the last seen bar are ignored.
+        """
+        if self.last_date is not None and date <= self.last_date:
+            return ''
+        if self.n < WARM_BARS:
+            return self._rebuild(self.history + [(date, open_, high, low, close, volume)])
+
+        i = self.n
+        params, replay = DEFAULT_PARAMS, self.replay
+        # Follow-through of pending absorption triggers; the newer trigger wins a shared bar
+        for tag, watch in sorted((item for item in self.watches.items() if item[1]), key=lambda item: item[1][0]):
+            row, trigger_open = watch
+            if (close < trigger_open) if tag == '⛔' else (close > trigger_open):
+                replay.mark(tag, i)
+                self.watches[tag] = None
+            elif i - row >= params.absorption_lookahead:
+                self.watches[tag] = None
+
+        self.volumes.append(volume)
+        avg_volume = math.fsum(self.volumes) / VOLUME_WINDOW
+        bull = close > open_
+        bear = open_ > close
+        candle_range = high - low
+        body = abs(close - open_)
+        heavy = volume > avg_volume * params.heavy_volume
+        surge = volume > avg_volume * params.surge_volume
+        active = volume > avg_volume * params.active_volume
+        bull_trigger = bull and active
+        bear_trigger = bear and active
+
+        tag = replay.turn(
+            i,
+            bull and close >= high - candle_range * params.extreme_band and heavy and body > self.prev_body,
+            bear and close <= low + candle_range * params.extreme_band and heavy and body > self.prev_body,
+            surge and high > max(self.highs),
+            surge and low < min(self.lows),
+            bull and body > candle_range * params.body_ratio and heavy,
+            bear and body > candle_range * params.body_ratio and heavy,
+            bull_trigger, -1, bear_trigger, -1
+        )
+        # A trigger's mark is placed later, once a bar follows through
+        if bull_trigger:
+            self.watches['⛔'] = (i, open_)
+        if bear_trigger:
+            self.watches['🚀'] = (i, open_)
+
+        self.highs.append(high)
+        self.lows.append(low)
+        self.prev_body = body
+        self.last_close = close
+        self.last_date = date
+        self.n += 1
+        return tag
+
+
+class IncrementalDetector:
+    """Incremental signal states for every symbol in the market."""
+
+    def __init__(self):
+        self.states = {}
+
+    @classmethod
+    def from_market(cls, df):
+        """Bootstrap from a cleaned long-format market frame."""
+        detector = cls()
+        df = df.sort_values(['symbol', 'date'], kind='stable')
+        for symbol, history in df.groupby('symbol', sort=False):
+            detector.states[symbol] = SymbolState.from_history(symbol, history)
+        return detector
+
+    def append(self, bars):
+        """Feed new EOD bars (long format, any symbols) and return the new signals.
+
+        Returns a ``symbol, date, tag, point_change`` frame with one row per
+        new bar that got a tag.
+        """
+        signals = []
+        bars = bars.sort_values('date', kind='stable')
+        for row in bars[COLUMNS].itertuples(index=False):
+            state = self.states.get(row.symbol)
+            if state is None:
+                state = self.states[row.symbol] = SymbolState(row.symbol)
+            last_close = state.last_close
+            tag = state.update(row.date, row.open, row.high, row.low, row.close, row.volume)
+            if tag:
+                signals.append({
+                    'symbol': row.symbol,
+                    'date': pd.Timestamp(row.date).strftime('%Y-%m-%d'),
+                    'tag': tag,
+                    'point_change': 0.0 if last_close is None else row.close - last_close
+                })
+        return pd.DataFrame(signals, columns=['symbol', 'date', 'tag', 'point_change'])
@@ -0,0 +1,127 @@
+"""Lightweight hot-path instrumentation.
+
+Code under measurement wraps a stage in :func:`timer` (wall time plus an
+optional row count) and reports cache lookups with :func:`cache_hit` /
+:func:`cache_miss`. Everything lands in the process-wide :data:`METRICS`
+registry, which keeps running totals per stage and the most recent
+individual events, and renders them as JSON or Prometheus text.
+"""
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+RECENT_EVENTS = 500
+
+
+class Span:
+    """One timed run of a stage; set ``rows`` while it is open."""
+
+    __slots__ = ('stage', 'labels', 'rows', 'start', 'seconds')
+
+    def __init__(self, stage, labels):
+        self.stage = stage
+        self.labels = labels
+        self.rows = None
+        self.start = time.perf_counter()
+        self.seconds = None
+
+
+class Metrics:
+    """Thread-safe registry of stage timings and cache hit/miss counts."""
+
+    def __init__(self, recent=RECENT_EVENTS):
+        self._lock = threading.Lock()
+        self._recent_size = recent
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+            self.caches = {}
+            self.recent = deque(maxlen=self._recent_size)
+
+    # --- Recording ---
+
+    def observe(self, stage, seconds, rows=None, **labels):
+        """Record one run of ``stage`` that took ``seconds``."""
+        with self._lock:
+            totals = self.stages.get(stage)
+            if totals is None:
+                totals = self.stages[stage] = {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'rows': 0}
+            totals['count'] += 1
+            totals['seconds'] += seconds
+            totals['max_seconds'] = max(totals['max_seconds'], seconds)
+            totals['rows'] += rows or 0
+            self.recent.append(dict(labels, stage=stage, seconds=seconds, rows=rows, at=time.time()))
+
+    @contextmanager
+    def timer(self, stage, rows=None, **labels):
+        """Time the ``with`` block as one run of ``stage``."""
+        span = Span(stage, labels)
+        span.rows = rows
+        try:
+            yield span
+        finally:
+            span.seconds = time.perf_counter() - span.start
+            self.observe(stage, span.seconds, span.rows, **labels)
+
+    def cache(self, name, hit):
+        with self._lock:
+            counts = self.caches.setdefault(name, {'hit': 0, 'miss': 0})
+            counts['hit' if hit else 'miss'] += 1
+
+    # --- Export ---
+
+    def snapshot(self):
+        """Plain-dict copy of every total and the recent events."""
+        with self._lock:
+            return {
+                'stages': {stage: dict(totals) for stage, totals in self.stages.items()},
+                'caches': {name: dict(counts) for name, counts in self.caches.items()},
+                'recent': list(self.recent),
+            }
+
+    def to_json(self, **options):
+        return json.dumps(self.snapshot(), **options)
+
+    def to_prometheus(self, prefix='quantexo'):
+        """Totals in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Wall time spent per stage.",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for stage, totals in sorted(snapshot['stages'].items()):
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {totals["seconds"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {totals["count"]}')
+        lines += [f"# HELP {prefix}_stage_max_seconds Slowest single run per stage.",
+                  f"# TYPE {prefix}_stage_max_seconds gauge"]
+        for stage, totals in sorted(snapshot['stages'].items()):
+            lines.append(f'{prefix}_stage_max_seconds{{stage="{stage}"}} {totals["max_seconds"]:.6f}')
+        lines += [f"# HELP {prefix}_stage_rows_total Rows processed per stage.",
+                  f"# TYPE {prefix}_stage_rows_total counter"]
+        for stage, totals in sorted(snapshot['stages'].items()):
+            lines.append(f'{prefix}_stage_rows_total{{stage="{stage}"}} {totals["rows"]}')
+        lines += [f"# HELP {prefix}_cache_requests_total Cache lookups by result.",
+                  f"# TYPE {prefix}_cache_requests_total counter"]
+        for name, counts in sorted(snapshot['caches'].items()):
+            for result in ('hit', 'miss'):
+                lines.append(f'{prefix}_cache_requests_total{{cache="{name}",result="{result}"}} {counts[result]}')
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = Metrics()
+
+
+def timer(stage, rows=None, **labels):
+    return METRICS.timer(stage, rows, **labels)
+
+
+def cache_hit(name):
+    METRICS.cache(name, True)
+
+
+def cache_miss(name):
+    METRICS.cache(name, False)
@@ -0,0 +1,56 @@
+"""Static chart export for the daily report.
+
+Figures are built in the calling process (they are cheap) and their JSON
+specs are rendered to PNG/SVG by kaleido on a process pool, one headless
+renderer per worker, since rendering is the slow part.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote
+
+from quantexo.charts import price_chart
+from quantexo.features import Features
+
+FORMATS = ('png', 'svg')
+EXPORT_WIDTH = 1800
+EXPORT_HEIGHT = 800
+
+
+def symbol_chart(market, index, symbol, view=None):
+    """Dashboard price chart of one symbol straight from the market store."""
+    df = market.get(symbol)
+    df['point_change'] = Features.from_columns(market.arrays(symbol)).point_change
+    return price_chart(df, index.for_symbol(symbol), symbol, view)
+
+
+def _render(spec, path, fmt, width, height):
+    import plotly.io as pio  # kaleido starts lazily inside each worker
+
+    pio.write_image(pio.from_json(spec, skip_invalid=True), path, format=fmt, width=width, height=height)
+    return path
+
+
+def export_charts(market, index, symbols, out_dir, fmt='png', workers=None,
+                  width=EXPORT_WIDTH, height=EXPORT_HEIGHT):
+    """Write one chart image per symbol into ``out_dir``; returns the paths.
+
+    Symbols without rows are skipped.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported chart format {fmt!r}; choose from {', '.join(FORMATS)}")
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = []
+    for symbol in symbols:
+        if symbol not in market:
+            continue
+        path = os.path.join(out_dir, f"{quote(symbol, safe='')}.{fmt}")
+        jobs.append((symbol_chart(market, index, symbol).to_json(), path))
+    if not jobs:
+        return []
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    if workers == 1:
+        return [_render(spec, path, fmt, width, height) for spec, path in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_render, spec, path, fmt, width, height) for spec, path in jobs]
+        return [future.result() for future in futures]
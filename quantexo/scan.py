@@ -0,0 +1,121 @@
+"""Whole-market scan engines.
+
+:func:`scan_market_batch` tags the whole ingested market frame in one
+columnar pass. :func:`scan_market` runs the per-symbol pipeline and splits
+the symbol universe into chunks on a process pool (CPU-bound detection) or
+a thread pool (I/O-bound sources). Its progress and per-symbol errors are
+reported back on the calling thread, so callers such as Streamlit can
+update widgets from the callbacks.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from quantexo.metrics import METRICS, timer
+from quantexo.signals import detect_signals, detect_signals_batch
+
+RESULT_COLUMNS = ['symbol', 'tag', 'date']
+SCAN_LOOKBACK = 10  # bars fed to detect_signals per symbol
+MIN_SCAN_BARS = 4  # Need at least 3 days for some signals; shorter symbols are skipped
+
+
+def scan_symbol(df, symbol, lookback=SCAN_LOOKBACK):
+    """Most recent signal for one symbol's ingested rows, or None."""
+    df = df.copy()
+    df['symbol'] = symbol
+    df.sort_values('date', inplace=True)
+    df.reset_index(drop=True, inplace=True)
+
+    if len(df) > lookback:
+        df = df.tail(lookback).copy()
+        df.reset_index(drop=True, inplace=True)
+
+    if len(df) >= MIN_SCAN_BARS:
+        results = detect_signals(df)
+        if results:
+            return max(results, key=lambda x: x['date'])
+    return None
+
+
+def _scan_chunk(frames, lookback):
+    """Scan a list of ``(symbol, df)`` pairs.
+
+    Returns (results, errors, scanned) with ``(symbol, seconds, rows)`` per
+    scanned symbol; timings travel back in the result because pool workers
+    do not share the parent's metrics registry.
+    """
+    results, errors, scanned = [], [], []
+    for symbol, df in frames:
+        start = time.perf_counter()
+        try:
+            signal = scan_symbol(df, symbol, lookback)
+        except Exception as e:
+            errors.append((symbol, str(e)))
+            signal = None
+        scanned.append((symbol, time.perf_counter() - start, len(df)))
+        if signal:
+            results.append(signal)
+    return results, errors, scanned
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def scan_market(market, symbols=None, workers=None, executor='process',
+                progress=None, on_error=None, lookback=SCAN_LOOKBACK):
+    """Scan many symbols and return their latest signals as one frame.
+
+    ``market`` is a :class:`~quantexo.data.MarketData`; ``symbols`` defaults
+    to every symbol in it. ``executor`` is ``'process'``, ``'thread'`` or
+    ``'serial'``. ``progress(done, total, symbol)`` is called as symbols
+    finish and ``on_error(symbol, message)`` for symbols that failed.
+    """
+    symbols = list(market.symbols if symbols is None else symbols)
+    frames = [(symbol, df) for symbol, df in ((s, market.get(s)) for s in symbols) if not df.empty]
+    total = len(symbols)
+    done = total - len(frames)  # symbols with no rows count as scanned
+    workers = max(1, workers or os.cpu_count() or 1)
+    all_results = []
+
+    def collect(chunk_result):
+        nonlocal done
+        results, errors, scanned = chunk_result
+        all_results.extend(results)
+        for symbol, message in errors:
+            if on_error:
+                on_error(symbol, message)
+        for symbol, seconds, rows in scanned:
+            METRICS.observe('scan_symbol', seconds, rows, symbol=symbol)
+            done += 1
+            if progress:
+                progress(done, total, symbol)
+
+    with timer('scan_market', rows=sum(len(df) for _, df in frames), executor=executor):
+        if executor == 'serial' or workers == 1 or len(frames) <= 1:
+            for frame in frames:
+                collect(_scan_chunk([frame], lookback))
+        else:
+            pool_cls = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+            # A few chunks per worker keeps the pool busy without pickling 300 tiny tasks
+            chunk_size = max(1, -(-len(frames) // (workers * 4)))
+            with pool_cls(max_workers=workers) as pool:
+                futures = [pool.submit(_scan_chunk, chunk, lookback) for chunk in _chunks(frames, chunk_size)]
+                for future in as_completed(futures):
+                    collect(future.result())
+
+    return pd.DataFrame(all_results, columns=RESULT_COLUMNS)
+
+
+def scan_market_batch(market, symbols=None, lookback=SCAN_LOOKBACK):
+    """Same result as :func:`scan_market`, computed for all symbols at once."""
+    frame = market.to_frame(symbols, tail=lookback)
+    # Symbols too short for scan_symbol are skipped, not tagged
+    frame = frame[frame.groupby('symbol', sort=False)['symbol'].transform('size').to_numpy() >= MIN_SCAN_BARS]
+    with timer('scan_batch', rows=len(frame)):
+        signals = detect_signals_batch(frame)
+    # Only the most recent signal of each symbol is reported
+    latest = signals.drop_duplicates('symbol', keep='last')
+    return latest[RESULT_COLUMNS].reset_index(drop=True)
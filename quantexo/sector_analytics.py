@@ -0,0 +1,88 @@
+"""Per-sector, per-day aggregates over all member symbols.
+
+Everything is computed for the whole market at once with grouped NumPy /
+pandas operations: signal counts by tag, bullish/bearish breadth, sector
+volume against its rolling average and a volume-weighted sector index
+chained from the members' daily returns.
+"""
+import numpy as np
+import pandas as pd
+
+from quantexo.sectors import symbol_to_sector
+from quantexo.signals import BEARISH_TAGS, BULLISH_TAGS, TAG_LABELS
+
+SECTOR_VOLUME_WINDOW = 20
+INDEX_BASE = 100.0
+# Heatmap metrics: label and the value the colour scale centres on
+SECTOR_METRICS = {
+    'breadth': ('Bullish breadth', 0.5),
+    'volume_ratio': ('Volume vs 20-day average', 1.0),
+    'bullish': ('Bullish signals', None),
+    'bearish': ('Bearish signals', None),
+    'index': ('Volume-weighted index', INDEX_BASE),
+}
+SECTOR_COLUMNS = (
+    ['sector', 'date', 'members'] + list(TAG_LABELS) +
+    ['bullish', 'bearish', 'breadth', 'volume', 'avg_volume', 'volume_ratio', 'index']
+)
+
+
+def sector_daily(prices, events):
+    """One row per sector and trading day.
+
+    ``prices`` is the cleaned long-format market frame and ``events`` the
+    placed signals (``symbol, date, tag``). ``breadth`` is the bullish share
+    of the day's signals (NaN without signals), ``volume_ratio`` the day's
+    sector volume over its 20-day average and ``index`` a volume-weighted
+    index of member returns starting at 100.
+    """
+    df = prices[['symbol', 'date', 'close', 'volume']].copy()
+    df['sector'] = df['symbol'].map(symbol_to_sector)
+    df = df[df['sector'].notna()].sort_values(['symbol', 'date'], kind='stable', ignore_index=True)
+    if df.empty:
+        return pd.DataFrame(columns=SECTOR_COLUMNS)
+
+    # Daily member returns; each symbol's first bar has none
+    symbols = df['symbol'].to_numpy()
+    close = df['close'].to_numpy(dtype=np.float64)
+    first = np.r_[True, symbols[1:] != symbols[:-1]]
+    returns = np.where(first, np.nan, close / np.r_[np.nan, close[:-1]] - 1)
+    volume = df['volume'].to_numpy(dtype=np.float64)
+    weighted = ~np.isnan(returns)
+    df['weighted_return'] = np.where(weighted, returns * volume, 0.0)
+    df['return_volume'] = np.where(weighted, volume, 0.0)
+
+    daily = df.groupby(['sector', 'date'], sort=True).agg(
+        members=('symbol', 'size'),
+        volume=('volume', 'sum'),
+        weighted_return=('weighted_return', 'sum'),
+        return_volume=('return_volume', 'sum'),
+    )
+
+    tagged = events[['symbol', 'date', 'tag']].copy()
+    tagged['sector'] = tagged['symbol'].map(symbol_to_sector)
+    counts = tagged.groupby(['sector', 'date', 'tag']).size().unstack('tag')
+    counts = counts.reindex(index=daily.index, columns=list(TAG_LABELS)).fillna(0).astype(np.int64)
+    daily = daily.join(counts)
+
+    daily['bullish'] = daily[list(BULLISH_TAGS)].sum(axis=1)
+    daily['bearish'] = daily[list(BEARISH_TAGS)].sum(axis=1)
+    signals = daily['bullish'] + daily['bearish']
+    daily['breadth'] = daily['bullish'] / signals.where(signals > 0)
+
+    by_sector = daily.groupby(level='sector', sort=False)
+    daily['avg_volume'] = by_sector['volume'].transform(
+        lambda v: v.rolling(SECTOR_VOLUME_WINDOW, min_periods=1).mean())
+    daily['volume_ratio'] = daily['volume'] / daily['avg_volume']
+    sector_return = (daily['weighted_return'] / daily['return_volume'].where(daily['return_volume'] > 0)).fillna(0)
+    daily['index'] = INDEX_BASE * (1 + sector_return).groupby(level='sector', sort=False).cumprod()
+
+    return daily.reset_index()[SECTOR_COLUMNS]
+
+
+def sector_matrix(daily, metric, days=None):
+    """``metric`` as a sector x date table (the heatmap layout), last ``days`` only."""
+    matrix = daily.pivot(index='sector', columns='date', values=metric)
+    if days:
+        matrix = matrix.iloc[:, -days:]
+    return matrix
@@ -0,0 +1,193 @@
+"""Process-wide market dataset with background end-of-day refresh.
+
+One :class:`SharedMarket` per server process holds the current
+:class:`~quantexo.data.MarketData`. Every session reads the same read-only
+arrays, and a daemon thread swaps in a fresh dataset after the sheet's EOD
+update, so user requests never wait on a download once the first load is
+done. Each swap also builds the dataset's signal index and a fresh
+per-symbol feature store.
+"""
+import threading
+from datetime import datetime, time, timedelta
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+from quantexo.data import MarketData, load_market, make_source
+from quantexo.features import FeatureStore
+from quantexo.fetch import NotModified
+from quantexo.history import HistoryStore
+from quantexo.metrics import cache_hit, cache_miss, timer
+from quantexo.signal_index import SignalIndex
+
+NPT = ZoneInfo('Asia/Kathmandu')
+# The sheet is updated by 8:00 PM NPT; leave it a little slack
+REFRESH_AT = time(20, 15)
+RETRY_SECONDS = 600
+
+
+def next_refresh(now=None, at=REFRESH_AT):
+    """Next refresh time (NPT) strictly after ``now``."""
+    now = now or datetime.now(NPT)
+    target = datetime.combine(now.astimezone(NPT).date(), at, tzinfo=NPT)
+    if target <= now:
+        target += timedelta(days=1)
+    return target
+
+
+class Snapshot(NamedTuple):
+    """One dataset and everything derived from it, swapped in as a unit."""
+    market: MarketData
+    index: SignalIndex
+    features: FeatureStore
+    version: int
+
+
+def _current(field, default=None):
+    """Read-only view of one field of the current snapshot."""
+    def read(self):
+        current = self._current
+        return default if current is None else getattr(current, field)
+    return property(read)
+
+
+class SharedMarket:
+    """Market dataset shared by every session of the process.
+
+    With ``history_dir`` set, a cold start serves the on-disk history at
+    once and catches up with the sheet in the background.
+    """
+
+    def __init__(self, source=None, history_dir=None, refresh_at=REFRESH_AT):
+        # One source object for the process keeps the sheet's ETag between refreshes
+        self.source = make_source(source)
+        self.history_dir = history_dir
+        self.refresh_at = refresh_at
+        self._current = None  # Snapshot; replaced, never mutated
+        self.loaded_at = None
+        self.last_error = None
+        self._attempted = False  # set once the first load has been tried
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    market = _current('market')
+    index = _current('index')
+    features = _current('features')
+    version = _current('version', 0)  # bumped on every swap; use it to key derived caches
+
+    def _fetch(self):
+        with timer('refresh'):
+            if self.history_dir:
+                store = HistoryStore(self.history_dir)
+                store.refresh(self.source)
+                return store.load_market()
+            return load_market(self.source)
+
+    def _swap(self, market):
+        # Precompute the signal index before readers can see the new data
+        version = self.version + 1
+        self._current = Snapshot(market, SignalIndex.build(market, version), FeatureStore(market, version), version)
+        self.loaded_at = datetime.now(NPT)
+
+    def _load(self):
+        """Fetch and swap; the caller holds the lock."""
+        try:
+            # Building the index can fail too; it must not escape into the refresh thread
+            self._swap(self._fetch())
+        except NotModified:
+            self.last_error = None
+            return True
+        except Exception as e:
+            self.last_error = e
+            # The download may have gone through; without this the retry would get a 304
+            if hasattr(self.source, 'forget'):
+                self.source.forget()
+            return False
+        self.last_error = None
+        return True
+
+    def refresh(self):
+        """Fetch now and swap the result in; returns False if the fetch failed.
+
+        Readers keep using the previous dataset until the swap, and an
+        unchanged sheet (HTTP 304) keeps it without a swap.
+        """
+        with self._lock:
+            return self._load()
+
+    def _first_load(self):
+        with self._lock:
+            # After one failed attempt the refresh thread retries, not the readers
+            if self.market is not None or self._attempted:
+                return
+            self._attempted = True
+            if self.history_dir:
+                store = HistoryStore(self.history_dir)
+                if store.symbols:
+                    try:
+                        self._swap(store.load_market())
+                    except Exception as e:
+                        self.last_error = e  # fall back to a full load
+                    else:
+                        threading.Thread(target=self.refresh, daemon=True).start()
+                        return
+            self._load()
+
+    def snapshot(self):
+        """Current :class:`Snapshot`; only calls before the first load attempt completes wait.
+
+        Take one per request and read only from it: a background swap
+        between separate reads would mix two datasets. If the first attempt
+        failed, this is an empty snapshot (with ``last_error`` set) until a
+        retry on the refresh thread succeeds.
+        """
+        current = self._current
+        if current is None:
+            cache_miss('market')
+            self._first_load()
+            current = self._current
+        else:
+            cache_hit('market')
+        if current is None:
+            empty = MarketData.empty()
+            current = Snapshot(empty, SignalIndex.build(empty), FeatureStore(empty), 0)
+        return current
+
+    def get(self):
+        """Current dataset (see :meth:`snapshot`)."""
+        return self.snapshot().market
+
+    def get_index(self):
+        """Signal index of the current dataset."""
+        return self.snapshot().index
+
+    def get_features(self, symbol):
+        """Memoised :class:`~quantexo.features.Features` of one symbol of the current dataset."""
+        return self.snapshot().features.get(symbol)
+
+    def start(self):
+        """Load in the background now and refresh after every EOD update.
+
+        A failed first load is retried every :data:`RETRY_SECONDS`.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='quantexo-refresh', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        self.get()
+        while self.market is None:
+            if self._stop.wait(RETRY_SECONDS):
+                return
+            self.refresh()
+        while not self._stop.is_set():
+            wait = (next_refresh(at=self.refresh_at) - datetime.now(NPT)).total_seconds()
+            if self._stop.wait(wait):
+                break
+            while not self.refresh():
+                if self._stop.wait(RETRY_SECONDS):
+                    return
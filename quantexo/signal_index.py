@@ -0,0 +1,100 @@
+"""Precomputed signal index.
+
+Built once per data version, it holds every tagged bar of the market (with
+the OHLC, ``point_change`` and ``avg_volume`` the chart hovers show) and the
+Scan All result table (latest signal per listed company, with its sector),
+every placed signal event and the per-sector daily aggregates, so page
+loads only do dictionary lookups.
+"""
+import numpy as np
+import pandas as pd
+
+from quantexo.metrics import cache_hit, cache_miss, timer
+from quantexo.scan import scan_market_batch
+from quantexo.sector_analytics import SECTOR_COLUMNS, sector_daily
+from quantexo.sectors import all_companies, symbol_to_sector
+from quantexo.signals import tag_market
+
+SCAN_COLUMNS = ['date', 'symbol', 'sector', 'tag']
+INDEX_COLUMNS = ['symbol', 'date', 'tag', 'open', 'high', 'low', 'close', 'volume', 'point_change', 'avg_volume']
+EVENT_COLUMNS = ['symbol', 'date', 'tag']
+
+
+def scan_table(results):
+    """Scan results laid out for display: newest first, with each symbol's sector."""
+    scan = results.sort_values(by=['date', 'symbol'], ascending=[False, True], kind='stable')
+    scan['sector'] = scan['symbol'].map(symbol_to_sector)
+    return scan[SCAN_COLUMNS].reset_index(drop=True)
+
+
+class SignalIndex:
+    """Signals of one data version, looked up by symbol, date or tag."""
+
+    def __init__(self, signals, scan, version=None, events=None, sectors=None):
+        self.signals = signals.reset_index(drop=True)
+        self.scan = scan
+        self.version = version
+        # Every placed signal (what detect_signals reports), unlike the final chart tags
+        self.events = pd.DataFrame(columns=EVENT_COLUMNS) if events is None else events
+        self.sectors = pd.DataFrame(columns=SECTOR_COLUMNS) if sectors is None else sectors
+        self._by_symbol = self.signals.groupby('symbol', sort=False).indices
+        self._by_date = self.signals.groupby('date', sort=False).indices
+        self._by_tag = self.signals.groupby('tag', sort=False).indices
+        self._csv = {}
+
+    @classmethod
+    def build(cls, market, version=None):
+        """Tag every symbol's full history and run the scan once."""
+        with timer('signal_index', rows=len(market)):
+            tagged, placed = tag_market(market.to_frame())
+            signals = tagged.loc[tagged['tag'] != '', INDEX_COLUMNS]
+            rows = np.array([i for i, _ in placed], dtype=np.int64)
+            events = pd.DataFrame({
+                'symbol': tagged['symbol'].to_numpy()[rows],
+                'date': tagged['date'].to_numpy()[rows],
+                'tag': [tag for _, tag in placed],
+            }, columns=EVENT_COLUMNS)
+
+            scan = scan_table(scan_market_batch(market, all_companies))
+            return cls(signals, scan, version, events, sector_daily(tagged, events))
+
+    @classmethod
+    def for_symbols(cls, market, symbols, version=None):
+        """Chart markers of just ``symbols``, without the scan, events or sector tables."""
+        with timer('signal_index_symbols', rows=len(market)):
+            tagged, _ = tag_market(market.to_frame(symbols))
+            return cls(tagged.loc[tagged['tag'] != '', INDEX_COLUMNS], pd.DataFrame(columns=SCAN_COLUMNS), version)
+
+    def _take(self, rows):
+        if rows is None:
+            return self.signals.iloc[0:0]
+        return self.signals.iloc[rows]
+
+    def for_symbol(self, symbol):
+        """Tagged bars of one symbol, date-sorted (what the chart marks)."""
+        return self._take(self._by_symbol.get(str(symbol).strip().upper()))
+
+    def on_date(self, date):
+        return self._take(self._by_date.get(pd.Timestamp(date)))
+
+    def with_tag(self, tag):
+        return self._take(self._by_tag.get(tag))
+
+    @property
+    def dates(self):
+        return np.sort(np.array(list(self._by_date), dtype='datetime64[ns]'))
+
+    def _encoded(self, name):
+        """Table ``name`` encoded as CSV bytes, built once per index."""
+        if name in self._csv:
+            cache_hit(f'{name}_csv')
+        else:
+            cache_miss(f'{name}_csv')
+            self._csv[name] = getattr(self, name).to_csv(index=False).encode('utf-8')
+        return self._csv[name]
+
+    def scan_csv(self):
+        return self._encoded('scan')
+
+    def sectors_csv(self):
+        return self._encoded('sectors')
@@ -0,0 +1,364 @@
+"""Columnar smart-money signal engine.
+
+Every rule input (body, range, volume baseline, 10-bar extremes, absorption
+follow-through) is computed for the whole history at once with NumPy, and
+all but the follow-through come from the shared feature layer. Only
+the rows where some rule can fire are then replayed in order, because the
+cooldowns and the single live absorption mark depend on which tags were
+actually placed before them.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from quantexo.features import Features, segment_layout
+
+TAG_LABELS = {
+    '🟢': '🟢 Aggressive Buyers',
+    '🔴': '🔴 Aggressive Sellers',
+    '⛔': '⛔ Buyer Absorption',
+    '🚀': '🚀 Seller Absorption',
+    '💥': '💥 Bullish POR',
+    '💣': '💣 Bearish POR',
+    '🐂': '🐂 Bullish POI',
+    '🐻': '🐻 Bearish POI'
+}
+
+# Reference text of each tag, shown by the dashboard's help section
+SIGNAL_DOCS = {
+    '🟢': {
+        'name': 'Aggressive Buying',
+        'description': 'Strong bullish candle closing near high with high volume, indicating buyer dominance',
+        'interpretation': 'Potential start of an uptrend or continuation pattern'
+    },
+    '🔴': {
+        'name': 'Aggressive Selling',
+        'description': 'Strong bearish candle closing near low with high volume, indicating seller dominance',
+        'interpretation': 'Potential start of a downtrend or continuation pattern'
+    },
+    '⛔': {
+        'name': 'Buyer Absorption',
+        'description': 'Bullish candle followed by price failing to drop below its open',
+        'interpretation': 'Buyers absorbing all selling pressure - potential reversal signal'
+    },
+    '🚀': {
+        'name': 'Seller Absorption',
+        'description': 'Bearish candle followed by price failing to rise above its open',
+        'interpretation': 'Sellers absorbing all buying pressure - potential reversal signal'
+    },
+    '💥': {
+        'name': 'Bullish Pivot Point Breakout',
+        'description': 'Price breaks above recent high with strong volume',
+        'interpretation': 'Potential start of new uptrend or breakout continuation'
+    },
+    '💣': {
+        'name': 'Bearish Pivot Point Breakdown',
+        'description': 'Price breaks below recent low with strong volume',
+        'interpretation': 'Potential start of new downtrend or breakdown continuation'
+    },
+    '🐂': {
+        'name': 'Bullish Point of Interest',
+        'description': 'Large bullish candle occupying >70% of range with high volume',
+        'interpretation': 'Strong buying interest at this price level'
+    },
+    '🐻': {
+        'name': 'Bearish Point of Interest',
+        'description': 'Large bearish candle occupying >70% of range with high volume',
+        'interpretation': 'Strong selling interest at this price level'
+    }
+}
+
+# Tags decided by the bar itself, in the order they overwrite each other
+BAR_TAGS = ('🟢', '🔴', '💥', '💣', '🐂', '🐻')
+# Direction each tag points to, as the signal guide describes them
+BULLISH_TAGS = ('🟢', '⛔', '💥', '🐂')
+BEARISH_TAGS = ('🔴', '🚀', '💣', '🐻')
+# A tag is suppressed if the same tag was placed within this many prior bars
+COOLDOWN = {'🟢': 9, '🔴': 9, '💥': 8, '💣': 8}
+BREAKOUT_LOOKBACK = 10
+ABSORPTION_LOOKAHEAD = 5
+
+
+class SignalParams(NamedTuple):
+    """Rule thresholds; the defaults are the dashboard's signals."""
+    heavy_volume: float = 2.0  # x average volume for 🟢/🔴/🐂/🐻
+    surge_volume: float = 1.8  # x average volume for 💥/💣
+    active_volume: float = 1.2  # x average volume for absorption triggers
+    extreme_band: float = 0.1  # share of the range a 🟢/🔴 close must be within of the extreme
+    body_ratio: float = 0.7  # body share of the range for 🐂/🐻
+    breakout_lookback: int = BREAKOUT_LOOKBACK
+    aggressive_cooldown: int = COOLDOWN['🟢']
+    breakout_cooldown: int = COOLDOWN['💥']
+    volume_window: int = 20  # volume average window, min(volume_window, max(min_volume_window, n // 2))
+    min_volume_window: int = 5
+    absorption_lookahead: int = ABSORPTION_LOOKAHEAD
+
+    @property
+    def cooldown(self):
+        return {'🟢': self.aggressive_cooldown, '🔴': self.aggressive_cooldown,
+                '💥': self.breakout_cooldown, '💣': self.breakout_cooldown}
+
+    def validate(self):
+        """Return ``self``, or raise ValueError naming the first field out of range."""
+        for name, (low, high) in PARAM_RANGES.items():
+            value = getattr(self, name)
+            if not low <= value <= high:  # also rejects NaN
+                raise ValueError(f"{name}={value!r} is out of range [{low}, {high}]")
+        for name in ('heavy_volume', 'surge_volume', 'active_volume'):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"{name}={getattr(self, name)!r} must be positive")
+        return self
+
+
+DEFAULT_PARAMS = SignalParams()
+# Inclusive bounds SignalParams.validate checks; the volume multipliers only need to be positive
+PARAM_RANGES = {
+    'extreme_band': (0, 1),
+    'body_ratio': (0, 1),
+    'breakout_lookback': (1, float('inf')),
+    'aggressive_cooldown': (0, float('inf')),
+    'breakout_cooldown': (0, float('inf')),
+    'volume_window': (1, float('inf')),
+    'min_volume_window': (1, float('inf')),
+    'absorption_lookahead': (0, float('inf')),
+}
+
+
+def average_volume(features, params=DEFAULT_PARAMS):
+    """Volume baseline the rules compare against."""
+    return features.volume_mean(params.volume_window, params.min_volume_window)
+
+
+def _absorption_targets(open_, close, trigger, below, position, length, lookahead=ABSORPTION_LOOKAHEAD):
+    """Row of the first of the next few bars closing beyond the trigger's open, else -1."""
+    n = len(close)
+    target = np.full(n, -1, dtype=np.int64)
+    rows = np.arange(n)
+    # Walk from the furthest bar to the nearest so the nearest hit wins
+    for k in range(lookahead, 0, -1):
+        if k >= n:
+            continue
+        ahead = close[k:]
+        hit = ahead < open_[:-k] if below else ahead > open_[:-k]
+        hit &= position[:-k] + k < length[:-k]
+        target[:-k][hit] = rows[:-k][hit] + k
+    target[~trigger] = -1
+    return target
+
+
+def signal_masks(features, params=DEFAULT_PARAMS):
+    """Rule masks for a :class:`~quantexo.features.Features` block.
+
+    Holds one boolean mask per bar tag, the absorption triggers
+    (``bull_trigger``/``bear_trigger``) and the row each trigger would
+    mark (``bull_target``/``bear_target``, -1 when nothing follows through).
+    """
+    f = features
+    position, length = f.position, f.length
+    live = position >= np.minimum(3, length - 1)
+
+    bull, bear = f.bull, f.bear
+    close, high, low = f.close, f.high, f.low
+    candle_range, body = f.candle_range, f.body
+    volume, avg_volume = f.volume, average_volume(f, params)
+    heavy = volume > avg_volume * params.heavy_volume
+    surge = volume > avg_volume * params.surge_volume
+    active = volume > avg_volume * params.active_volume
+
+    breakout_ready = live & (position >= params.breakout_lookback) & surge
+
+    masks = {
+        '🟢': live & bull & (close >= high - candle_range * params.extreme_band) & heavy & (body > f.prev_body),
+        '🔴': live & bear & (close <= low + candle_range * params.extreme_band) & heavy & (body > f.prev_body),
+        '💥': breakout_ready & (high > f.prior_high(params.breakout_lookback)),
+        '💣': breakout_ready & (low < f.prior_low(params.breakout_lookback)),
+        '🐂': live & bull & (body > candle_range * params.body_ratio) & heavy,
+        '🐻': live & bear & (body > candle_range * params.body_ratio) & heavy,
+        'bull_trigger': live & bull & active,
+        'bear_trigger': live & bear & active,
+    }
+    lookahead = params.absorption_lookahead
+    masks['bull_target'] = _absorption_targets(f.open, close, masks['bull_trigger'], True, position, length, lookahead)
+    masks['bear_target'] = _absorption_targets(f.open, close, masks['bear_trigger'], False, position, length, lookahead)
+    return masks
+
+
+class TagReplay:
+    """Precedence, cooldown and absorption-mark state of one symbol.
+
+    :meth:`turn` applies one bar's rules in their original order. At most
+    one ⛔ and one 🚀 mark exist at a time, because every absorption trigger
+    wipes the previous mark of its kind before placing its own.
+    """
+    __slots__ = ('last', 'bull_at', 'bear_at', 'cooldown')
+
+    def __init__(self, cooldown=COOLDOWN):
+        self.cooldown = cooldown
+        self.last = dict.fromkeys(cooldown, -10 ** 9)  # row each cooldown tag was last placed
+        self.bull_at = self.bear_at = -1  # row holding the ⛔ / 🚀 mark, -1 for none
+
+    def mark(self, tag, row):
+        """Move the ⛔ or 🚀 mark to ``row``, overwriting the other kind there."""
+        if tag == '⛔':
+            self.bull_at = row
+            if row != -1 and self.bear_at == row:
+                self.bear_at = -1
+        else:
+            self.bear_at = row
+            if row != -1 and self.bull_at == row:
+                self.bull_at = -1
+
+    def turn(self, i, green, red, boom, doom, bull_poi, bear_poi,
+             bull_trigger, bull_target, bear_trigger, bear_target):
+        """Tag row ``i`` given its rule flags; returns the tag it ends up with."""
+        last, cooldown = self.last, self.cooldown
+        tag = '⛔' if self.bull_at == i else '🚀' if self.bear_at == i else ''
+        if green and i - last['🟢'] > cooldown['🟢']:
+            tag = '🟢'
+        if red and i - last['🔴'] > cooldown['🔴']:
+            tag = '🔴'
+        # An absorption trigger wipes the previous mark and places a new one ahead
+        if bull_trigger:
+            if tag == '⛔':
+                tag = ''
+            self.mark('⛔', bull_target)
+        if bear_trigger:
+            if tag == '🚀':
+                tag = ''
+            self.mark('🚀', bear_target)
+        if boom and i - last['💥'] > cooldown['💥']:
+            tag = '💥'
+        if doom and i - last['💣'] > cooldown['💣']:
+            tag = '💣'
+        if bull_poi:
+            tag = '🐂'
+        if bear_poi:
+            tag = '🐻'
+
+        if self.bull_at == i and tag != '⛔':
+            self.bull_at = -1
+        if self.bear_at == i and tag != '🚀':
+            self.bear_at = -1
+        if tag in last:
+            last[tag] = i
+        return tag
+
+    def place_marks(self, final):
+        if self.bull_at != -1:
+            final[self.bull_at] = '⛔'
+        if self.bear_at != -1:
+            final[self.bear_at] = '🚀'
+
+
+def resolve_tags(masks, starts=None, params=DEFAULT_PARAMS):
+    """Replay rule precedence over the rows where something can happen.
+
+    Returns ``(placed, final)``: ``placed`` lists ``(row, tag)`` for every
+    row that held a tag once its own turn was done (what the scan reports);
+    ``final`` is the tag column left at the end, where only the latest
+    ⛔/🚀 absorption mark of each symbol survives.
+    """
+    bull_target, bear_target = masks['bull_target'], masks['bear_target']
+    n = len(bull_target)
+    busy = masks['bull_trigger'] | masks['bear_trigger']
+    for tag in BAR_TAGS:
+        busy = busy | masks[tag]
+    marked = np.concatenate([bull_target[bull_target >= 0], bear_target[bear_target >= 0]])
+    rows = np.union1d(np.flatnonzero(busy), marked)
+    group, _, _ = segment_layout(n, starts)
+
+    flags = zip(
+        rows.tolist(), group[rows].tolist(),
+        *(masks[tag][rows].tolist() for tag in BAR_TAGS),
+        masks['bull_trigger'][rows].tolist(), bull_target[rows].tolist(),
+        masks['bear_trigger'][rows].tolist(), bear_target[rows].tolist()
+    )
+    final = np.full(n, '', dtype=object)
+    placed = []
+    current, replay = -1, None
+    cooldown = params.cooldown
+
+    for i, g, *rules in flags:
+        if g != current:
+            if replay:
+                replay.place_marks(final)
+            current, replay = g, TagReplay(cooldown)
+        tag = replay.turn(i, *rules)
+        if tag:
+            placed.append((i, tag))
+            if tag not in ('⛔', '🚀'):
+                final[i] = tag
+
+    if replay:
+        replay.place_marks(final)
+    return placed, final
+
+
+def detect_signals(df, params=DEFAULT_PARAMS):
+    """Tag one symbol's cleaned, date-sorted history in place.
+
+    Adds ``point_change`` and ``tag`` columns to ``df`` and returns the
+    signals as ``{'symbol', 'tag', 'date'}`` records.
+    """
+    df['point_change'] = df['close'].diff().fillna(0)
+    df['tag'] = ''
+    if df.empty:
+        return []
+
+    masks = signal_masks(Features.from_columns(df), params)
+    placed, final = resolve_tags(masks, params=params)
+    df['tag'] = final
+
+    symbols = df['symbol'].to_numpy()
+    dates = df['date'].to_numpy()
+    return [
+        {
+            'symbol': symbols[i],
+            'tag': tag,
+            'date': pd.Timestamp(dates[i]).strftime('%Y-%m-%d')
+        }
+        for i, tag in placed
+    ]
+
+
+def tag_market(df, params=DEFAULT_PARAMS):
+    """Tag a long-format market frame in one columnar pass.
+
+    ``df`` has cleaned ``date, symbol, open, high, low, close, volume``
+    columns in any row order. Returns ``(tagged, placed)``: a copy sorted by
+    symbol and date with ``point_change``, ``avg_volume`` and the final
+    ``tag`` column that :func:`detect_signals` would leave on each symbol,
+    and the ``(row, tag)`` list of every placed signal.
+    """
+    df = df.sort_values(['symbol', 'date'], kind='stable', ignore_index=True)
+    symbols = df['symbol'].to_numpy()
+    if len(df) == 0:
+        return df.assign(point_change=[], avg_volume=[], tag=[]), []
+    starts = np.flatnonzero(np.r_[True, symbols[1:] != symbols[:-1]])
+
+    features = Features.from_columns(df, starts)
+    masks = signal_masks(features, params)
+    placed, final = resolve_tags(masks, starts, params)
+
+    df['point_change'] = features.point_change
+    df['avg_volume'] = average_volume(features, params)
+    df['tag'] = final
+    return df, placed
+
+
+def detect_signals_batch(df, params=DEFAULT_PARAMS):
+    """Tag every symbol of a long-format market frame in one columnar pass.
+
+    Returns a tidy ``symbol, date, tag`` frame with one row per placed
+    signal, the same records :func:`detect_signals` returns symbol by symbol.
+    """
+    df, placed = tag_market(df, params)
+    if not placed:
+        return pd.DataFrame(columns=['symbol', 'date', 'tag'])
+    rows = np.array([i for i, _ in placed], dtype=np.int64)
+    return pd.DataFrame({
+        'symbol': df['symbol'].to_numpy()[rows],
+        'date': pd.DatetimeIndex(df['date'].to_numpy()[rows]).strftime('%Y-%m-%d'),
+        'tag': [tag for _, tag in placed],
+    })
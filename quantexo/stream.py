@@ -0,0 +1,378 @@
+"""Intraday streaming: ticks to candles to live signals.
+
+Trades (``symbol,time,price,volume``) or pre-aggregated bars
+(``symbol,time,open,high,low,close,volume``) arrive as CSV or JSON lines
+from a file being appended to, a TCP socket or the synthetic feed.
+:class:`CandleBuilder` rolls them into fixed-interval candles and every
+completed candle goes through its symbol's
+:class:`~quantexo.incremental.SymbolState`, so a bar gets the tag a full
+:func:`~quantexo.signals.detect_signals` rerun over the symbol's bars so
+far would give it.
+
+Memory stays bounded: a symbol keeps its last :data:`BAR_WINDOW` candles in
+a ring buffer next to the detector's fixed-size windows, and the stream
+keeps the last :data:`SIGNAL_WINDOW` signals. Candles close when the feed
+moves into a later interval (feed time, not wall-clock time), so replaying
+a recorded file gives the same bars the live feed did::
+
+    python -m quantexo.stream --file ticks.csv --follow
+    python -m quantexo.stream --connect 127.0.0.1:9000 --interval 5min
+    python -m quantexo.stream --demo 20 --speed 600
+"""
+import argparse
+import json
+import math
+import socket
+import sys
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+from quantexo.incremental import BAR_FIELDS, SymbolState
+from quantexo.metrics import timer
+
+INTERVAL = '1min'
+BAR_WINDOW = 240  # one NEPSE session (11:00-15:00) of one-minute candles
+SIGNAL_WINDOW = 1000
+TICK_FIELDS = ['symbol', 'time', 'price', 'volume']
+FEED_BAR_FIELDS = ['symbol', 'time', 'open', 'high', 'low', 'close', 'volume']
+SIGNAL_COLUMNS = ['seq', 'symbol', 'time', 'tag', 'close', 'point_change']
+RETRY_SECONDS = 5
+FEED_TZ = 'Asia/Kathmandu'  # naive feed times are NPT wall-clock times
+
+
+def parse_line(line):
+    """One feed line as ``(symbol, time, open, high, low, close, volume)``.
+
+    CSV lines carry 4 fields (a trade) or 7 (a bar); JSON objects use the
+    same field names. Times with a UTC offset are converted to naive NPT
+    times. Headers, blank and malformed lines, and lines with a missing
+    time or a non-finite number give None.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        if line.startswith('{'):
+            record = json.loads(line)
+            values = [record[key] for key in (TICK_FIELDS if 'price' in record else FEED_BAR_FIELDS)]
+        else:
+            values = line.split(',')
+        if len(values) == 4:
+            symbol, stamp, price, volume = values
+            open_ = high = low = close = float(price)
+        elif len(values) == 7:
+            symbol, stamp = values[:2]
+            open_, high, low, close = (float(v) for v in values[2:6])
+            volume = values[6]
+        else:
+            return None
+        stamp, volume = pd.Timestamp(stamp), float(volume)
+    except (ValueError, KeyError, TypeError):
+        return None
+    if pd.isna(stamp) or not all(map(math.isfinite, (open_, high, low, close, volume))):
+        return None
+    if stamp.tzinfo is not None:
+        # Mixing aware and naive times would break the candle clock
+        stamp = stamp.tz_convert(FEED_TZ).tz_localize(None)
+    return str(symbol).strip().upper(), stamp, open_, high, low, close, volume
+
+
+# --- Candles ---
+
+class CandleBuilder:
+    """Rolls trades and sub-interval bars into fixed-interval candles.
+
+    A candle is stamped with the start of its interval. Input older than
+    the newest interval seen on the feed is counted in ``late`` and dropped.
+    """
+
+    def __init__(self, interval=INTERVAL):
+        self.interval = pd.Timedelta(interval)
+        self.clock = None  # start of the newest interval on the feed
+        self.late = 0
+        self._open = {}  # symbol -> [start, open, high, low, close, volume]
+
+    def add(self, symbol, stamp, open_, high, low, close, volume):
+        """Add one trade or bar; returns the candles it completed."""
+        start = stamp.floor(self.interval)
+        completed = []
+        if self.clock is None or start > self.clock:
+            completed = self.flush()
+            self.clock = start
+        elif start < self.clock:
+            self.late += 1
+            return completed
+
+        candle = self._open.get(symbol)
+        if candle is None:
+            self._open[symbol] = [start, open_, high, low, close, volume]
+        else:
+            candle[2] = max(candle[2], high)
+            candle[3] = min(candle[3], low)
+            candle[4] = close
+            candle[5] += volume
+        return completed
+
+    def flush(self):
+        """Close every open candle (end of session or feed)."""
+        completed = [(symbol, *candle) for symbol, candle in self._open.items()]
+        self._open = {}
+        return completed
+
+    def __len__(self):
+        return len(self._open)
+
+
+# --- Stream ---
+
+class IntradayStream:
+    """Live candles and signals of every symbol on the feed.
+
+    Safe to read from other threads while a :class:`StreamRunner` feeds
+    it; ``subscribe`` callbacks run on the feeding thread.
+    """
+
+    def __init__(self, interval=INTERVAL, window=BAR_WINDOW, max_signals=SIGNAL_WINDOW):
+        self.candles = CandleBuilder(interval)
+        self.window = window
+        self.states = {}
+        self.bars = {}  # symbol -> ring buffer of (time, open, high, low, close, volume)
+        self.signals = deque(maxlen=max_signals)
+        self.seq = 0  # number of signals fired so far
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        """Call ``callback(signal)`` for every signal fired from now on."""
+        self._listeners.append(callback)
+
+    def _notify(self, signals):
+        # Called without the lock held, so listeners may read the stream
+        for signal in signals:
+            for callback in self._listeners:
+                callback(signal)
+        return signals
+
+    def push(self, symbol, stamp, open_, high, low, close, volume):
+        """Feed one trade or bar; returns the signals of the candles it completed."""
+        with self._lock:
+            signals = self._complete(self.candles.add(symbol, stamp, open_, high, low, close, volume))
+        return self._notify(signals)
+
+    def push_line(self, line):
+        record = parse_line(line)
+        return [] if record is None else self.push(*record)
+
+    def flush(self):
+        """Complete the open candles, e.g. at the close or the end of a replay."""
+        with self._lock:
+            signals = self._complete(self.candles.flush())
+        return self._notify(signals)
+
+    def _complete(self, completed):
+        if not completed:
+            return []
+        signals = []
+        with timer('stream_bars', rows=len(completed)):
+            for symbol, stamp, open_, high, low, close, volume in completed:
+                state = self.states.get(symbol)
+                if state is None:
+                    state = self.states[symbol] = SymbolState(symbol)
+                    self.bars[symbol] = deque(maxlen=self.window)
+                last_close = state.last_close
+                tag = state.update(stamp, open_, high, low, close, volume)
+                self.bars[symbol].append((stamp, open_, high, low, close, volume))
+                if tag:
+                    self.seq += 1
+                    signal = {
+                        'seq': self.seq, 'symbol': symbol, 'time': stamp, 'tag': tag, 'close': close,
+                        'point_change': 0.0 if last_close is None else close - last_close
+                    }
+                    self.signals.append(signal)
+                    signals.append(signal)
+        return signals
+
+    # --- Reads ---
+
+    def signals_since(self, seq=0):
+        """Kept signals numbered after ``seq``, oldest first."""
+        with self._lock:
+            return [signal for signal in self.signals if signal['seq'] > seq]
+
+    def signal_frame(self):
+        with self._lock:
+            return pd.DataFrame(list(self.signals), columns=SIGNAL_COLUMNS)
+
+    def recent_bars(self, symbol):
+        """Kept candles of one symbol, oldest first."""
+        with self._lock:
+            rows = list(self.bars.get(str(symbol).strip().upper(), ()))
+        return pd.DataFrame(rows, columns=BAR_FIELDS)
+
+    def latest(self):
+        """Last completed candle of every symbol."""
+        with self._lock:
+            rows = [(symbol, *bars[-1]) for symbol, bars in self.bars.items() if bars]
+        return pd.DataFrame(rows, columns=['symbol'] + BAR_FIELDS).sort_values('symbol', ignore_index=True)
+
+
+# --- Feeds ---
+
+def follow_file(path, follow=True, poll=0.5, stop=None):
+    """Lines of ``path``; with ``follow``, keep waiting for appended lines like ``tail -f``."""
+    with open(path, encoding='utf-8') as f:
+        partial = ''
+        while stop is None or not stop.is_set():
+            line = f.readline()
+            if line.endswith('\n'):
+                yield partial + line
+                partial = ''
+            elif line:
+                partial += line  # the writer is mid-line; wait for the rest
+            elif not follow:
+                break
+            elif stop is not None:
+                stop.wait(poll)
+            else:
+                time.sleep(poll)
+        if partial and not follow:
+            yield partial
+
+
+def socket_lines(address, timeout=10, stop=None):
+    """Lines sent by a TCP feed at ``host:port`` until it closes the connection."""
+    host, port = address.rsplit(':', 1)
+    with socket.create_connection((host, int(port)), timeout=timeout) as sock:
+        sock.settimeout(None)
+        with sock.makefile('r', encoding='utf-8') as f:
+            for line in f:
+                yield line
+                if stop is not None and stop.is_set():
+                    return
+
+
+def replay(ticks, speed=None, stop=None):
+    """CSV lines of a trade frame (``symbol, time, price, volume``).
+
+    With ``speed``, lines are paced at ``speed`` feed seconds per second.
+    """
+    started, first = time.monotonic(), None
+    for row in ticks[TICK_FIELDS].itertuples(index=False):
+        if stop is not None and stop.is_set():
+            return
+        if speed:
+            first = row.time if first is None else first
+            wait = (row.time - first).total_seconds() / speed - (time.monotonic() - started)
+            if wait > 0:
+                time.sleep(wait)
+        yield f"{row.symbol},{row.time.isoformat()},{row.price},{row.volume}\n"
+
+
+def feed_lines(spec, follow=True, stop=None):
+    """Lines of a feed given as ``tcp://host:port`` or a file path."""
+    if spec.startswith('tcp://'):
+        return socket_lines(spec[len('tcp://'):], stop=stop)
+    return follow_file(spec, follow, stop=stop)
+
+
+class StreamRunner:
+    """Feeds an :class:`IntradayStream` from a feed on a daemon thread.
+
+    A socket that drops or closes is reconnected after :data:`RETRY_SECONDS`;
+    a file that is not followed ends the run and completes its open candles.
+    A line that fails to process is skipped and counted in ``bad_lines``,
+    and its exception is left in ``error``.
+    """
+
+    def __init__(self, stream, spec, follow=True):
+        self.stream = stream
+        self.spec = spec
+        self.follow = follow
+        self.lines = 0
+        self.bad_lines = 0
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='quantexo-stream', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            bad_lines = self.bad_lines
+            try:
+                for line in feed_lines(self.spec, self.follow, self._stop):
+                    self.lines += 1
+                    try:
+                        self.stream.push_line(line)
+                    except Exception as e:
+                        # One bad line must not end the feed
+                        self.bad_lines += 1
+                        self.error = e
+            except OSError as e:
+                self.error = e
+                if self._stop.wait(RETRY_SECONDS):
+                    break
+                continue
+            if self.bad_lines == bad_lines:
+                self.error = None
+            # A feed that closed cleanly is reconnected too, but not in a tight loop
+            if not self.spec.startswith('tcp://') or self._stop.wait(RETRY_SECONDS):
+                break
+        self.stream.flush()
+
+
+# --- Command line ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m quantexo.stream', description="Tag intraday candles as a feed streams in.")
+    feed = parser.add_mutually_exclusive_group(required=True)
+    feed.add_argument('--file', help="trade/bar lines (CSV or JSON), e.g. a file another process appends to")
+    feed.add_argument('--connect', metavar='HOST:PORT', help="TCP feed sending one line per trade/bar")
+    feed.add_argument('--demo', type=int, metavar='N', help="synthetic session of N symbols")
+    parser.add_argument('--follow', action='store_true', help="keep reading lines appended to --file")
+    parser.add_argument('--speed', type=float, help="pace --demo at this many feed seconds per second")
+    parser.add_argument('--interval', default=INTERVAL, help="candle interval (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    stream = IntradayStream(args.interval)
+    stream.subscribe(lambda s: print(f"{s['time']:%Y-%m-%d %H:%M},{s['symbol']},{s['tag']},{s['close']},{s['point_change']:.2f}", flush=True))
+    print('time,symbol,tag,close,point_change', flush=True)
+    if args.demo:
+        from quantexo.synthetic import synthetic_ticks
+        lines = replay(synthetic_ticks(args.demo), args.speed)
+    elif args.connect:
+        lines = socket_lines(args.connect)
+    else:
+        lines = follow_file(args.file, args.follow)
+
+    try:
+        for line in lines:
+            stream.push_line(line)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"error: feed failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        stream.flush()
+    print(f"{sum(len(bars) for bars in stream.bars.values())} candles kept for {len(stream.bars)} symbols, "
+          f"{stream.seq} signals, {stream.candles.late} late lines dropped", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
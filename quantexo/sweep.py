@@ -0,0 +1,219 @@
+"""Grid and random-search sweeps over the signal thresholds.
+
+Every parameter set is run over the whole market with the batch engine and
+scored with the backtester's forward returns. Each worker keeps one
+whole-market :class:`~quantexo.features.Features`, so inputs that do not
+depend on the parameters are computed once and the volume baselines and
+breakout extremes once per window, and sets differing only in multipliers
+reuse them. Sets are ordered so each worker sees runs sharing those arrays::
+
+    python -m quantexo.sweep --source prices.csv --grid heavy_volume=1.5,2,2.5 \\
+        --grid body_ratio=0.6,0.7,0.8 --output ranked.csv
+    python -m quantexo.sweep --source prices.csv --random 200 --range surge_volume=1.2:2.5 \\
+        --range breakout_lookback=5:20 --horizon 10
+"""
+import argparse
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from quantexo.backtest import HORIZONS, forward_outcomes
+from quantexo.data import SHEET_URL, load_market
+from quantexo.features import Features
+from quantexo.signals import BEARISH_TAGS, DEFAULT_PARAMS, SignalParams, resolve_tags, signal_masks
+
+PARAM_FIELDS = SignalParams._fields
+INT_FIELDS = {name for name in PARAM_FIELDS if isinstance(getattr(DEFAULT_PARAMS, name), int)}
+MIN_SIGNALS = 30  # sets with fewer signals are ranked last
+
+
+# --- Parameter sets ---
+
+def _typed(name, value):
+    """``value`` as the field's type; raises ValueError for anything else."""
+    if name not in PARAM_FIELDS:
+        raise ValueError(f"unknown parameter {name!r}; choose from {', '.join(PARAM_FIELDS)}")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name}={value!r} is not a number") from None
+    if name in INT_FIELDS:
+        if not number.is_integer():
+            raise ValueError(f"{name}={value!r} must be a whole number")
+        return int(number)
+    return number
+
+
+def grid(**values):
+    """Every combination of the given values; other fields keep their defaults."""
+    names = list(values)
+    return [
+        DEFAULT_PARAMS._replace(**{name: _typed(name, v) for name, v in zip(names, combo)}).validate()
+        for combo in itertools.product(*values.values())
+    ]
+
+
+def random_search(n, seed=None, **ranges):
+    """``n`` random sets; a ``(low, high)`` tuple is a range, a list a set of choices."""
+    rng = np.random.default_rng(seed)
+    sets = []
+    for _ in range(n):
+        values = {}
+        for name, spec in ranges.items():
+            if isinstance(spec, tuple):
+                low, high = spec
+                value = rng.integers(low, high + 1) if name in INT_FIELDS else round(rng.uniform(low, high), 3)
+            else:
+                value = spec[rng.integers(len(spec))]
+            values[name] = _typed(name, value)
+        sets.append(DEFAULT_PARAMS._replace(**values).validate())
+    return sets
+
+
+# --- Runs ---
+
+class SweepData:
+    """Market arrays shared by every run of a sweep."""
+
+    def __init__(self, market, horizons=HORIZONS):
+        self.columns = market.columns
+        self.starts = market.offsets[:-1]
+        self.row_ends = np.repeat(market.offsets[1:], np.diff(market.offsets))
+        self.features = Features.from_columns(market.columns, self.starts)
+        self.horizons = horizons
+
+    def run(self, params):
+        """Signal count, mean direction-signed return and hit rate per horizon."""
+        stats = {'signals': 0}
+        for n in self.horizons:
+            stats[f'avg_ret_{n}'] = stats[f'hit_rate_{n}'] = np.nan
+        if not len(self.starts):
+            return stats
+
+        masks = signal_masks(self.features, params)
+        placed, _ = resolve_tags(masks, self.starts, params)
+        stats['signals'] = len(placed)
+        if not placed:
+            return stats
+
+        rows = np.array([i for i, _ in placed], dtype=np.int64)
+        direction = np.where(np.isin([tag for _, tag in placed], BEARISH_TAGS), -1, 1)
+        outcomes = forward_outcomes(self.columns, rows, self.row_ends[rows], direction, self.horizons)
+        for n in self.horizons:
+            ret = outcomes[f'ret_{n}']
+            if np.isfinite(ret).any():
+                stats[f'avg_ret_{n}'] = np.nanmean(ret)
+                stats[f'hit_rate_{n}'] = np.nanmean(outcomes[f'hit_{n}'])
+        return stats
+
+
+_DATA = None
+
+
+def _init_worker(market, horizons):
+    global _DATA
+    _DATA = SweepData(market, horizons)
+
+
+def _run_chunk(param_sets):
+    return [dict(params._asdict(), **_DATA.run(params)) for params in param_sets]
+
+
+def _sharing_order(params):
+    # Runs sharing a volume baseline and breakout window sit next to each other
+    return (params.volume_window, params.min_volume_window, params.breakout_lookback)
+
+
+def sweep(market, param_sets, horizon=5, metric='avg_ret', workers=None, executor='process',
+          horizons=HORIZONS, min_signals=MIN_SIGNALS):
+    """Run every parameter set over ``market`` and rank them.
+
+    Sets are ranked by ``{metric}_{horizon}`` (``avg_ret`` or ``hit_rate``),
+    best first; sets with fewer than ``min_signals`` signals go last.
+    ``executor`` is ``'process'`` or ``'serial'``.
+    """
+    horizons = tuple(sorted(set(horizons) | {horizon}))
+    if horizons[0] < 1:
+        # A horizon of 0 scores nothing and a negative one looks back
+        raise ValueError(f"horizons must be at least 1 bar, got {horizons[0]}")
+    param_sets = sorted(dict.fromkeys(params.validate() for params in param_sets), key=_sharing_order)
+    if not param_sets:
+        raise ValueError("no parameter sets to run")
+    workers = max(1, min(workers or os.cpu_count() or 1, len(param_sets)))
+
+    if executor == 'serial' or workers == 1:
+        _init_worker(market, horizons)
+        rows = _run_chunk(param_sets)
+    else:
+        # Contiguous chunks keep sets that share arrays on the same worker
+        size = -(-len(param_sets) // workers)
+        chunks = [param_sets[i:i + size] for i in range(0, len(param_sets), size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(market, horizons)) as pool:
+            rows = [row for chunk in pool.map(_run_chunk, chunks) for row in chunk]
+
+    results = pd.DataFrame(rows)
+    score = f'{metric}_{horizon}'
+    results['enough_signals'] = results['signals'] >= min_signals
+    results = results.sort_values(['enough_signals', score], ascending=[False, False], na_position='last',
+                                  kind='stable', ignore_index=True)
+    results.insert(0, 'rank', np.arange(1, len(results) + 1))
+    return results
+
+
+# --- Command line ---
+
+def _assignment(text):
+    name, _, value = text.partition('=')
+    if name not in PARAM_FIELDS:
+        raise argparse.ArgumentTypeError(f"unknown parameter {name!r}; choose from {', '.join(PARAM_FIELDS)}")
+    return name, value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m quantexo.sweep', description="Rank signal threshold sets by forward returns.")
+    parser.add_argument('--source', default=os.environ.get('QUANTEXO_DATA', SHEET_URL))
+    parser.add_argument('--grid', type=_assignment, action='append', default=[], metavar='NAME=V1,V2,...')
+    parser.add_argument('--random', type=int, default=0, metavar='N', help="number of random sets")
+    parser.add_argument('--range', type=_assignment, action='append', default=[], metavar='NAME=LOW:HIGH',
+                        help="random-search range (or V1,V2,... choices)")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--horizon', type=int, default=5, help="forward bars the ranking uses")
+    parser.add_argument('--metric', choices=('avg_ret', 'hit_rate'), default='avg_ret')
+    parser.add_argument('--min-signals', type=int, default=MIN_SIGNALS)
+    parser.add_argument('--workers', '-j', type=int)
+    parser.add_argument('--output', '-o', default='-', help="CSV file, '-' for stdout (default)")
+    args = parser.parse_args(argv)
+    if args.horizon < 1:
+        parser.error(f"--horizon must be at least 1, not {args.horizon}")
+
+    param_sets = [DEFAULT_PARAMS]
+    try:
+        if args.grid:
+            param_sets += grid(**{name: value.split(',') for name, value in args.grid})
+        if args.random:
+            ranges = {
+                name: tuple(float(v) for v in value.split(':')) if ':' in value else value.split(',')
+                for name, value in args.range
+            }
+            param_sets += random_search(args.random, args.seed, **ranges)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        market = load_market(args.source)
+    except Exception as e:
+        print(f"error: could not load {args.source}: {e}", file=sys.stderr)
+        return 1
+    results = sweep(market, param_sets, args.horizon, args.metric, args.workers, min_signals=args.min_signals)
+    results.to_csv(sys.stdout if args.output == '-' else args.output, index=False)
+    print(f"ranked {len(results)} parameter sets over {len(market)} rows", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
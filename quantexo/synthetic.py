@@ -0,0 +1,91 @@
+"""Synthetic NEPSE-like price data for offline development and benchmarks.
+
+Prices follow a random walk per symbol on a Sunday-Thursday trading
+calendar, with occasional volume spikes so every signal type shows up.
+:func:`synthetic_sheet` renders the rows the way the sheet export does
+(padded symbols, thousands separators, no particular row order).
+"""
+import numpy as np
+import pandas as pd
+
+from quantexo.data import COLUMNS
+from quantexo.sectors import all_companies
+
+SHEET_HEADER = ['Date', 'Symbol', 'Open', 'High', 'Low', 'Close', 'Volume']
+TRADING_DAYS = 'Sun Mon Tue Wed Thu'
+DAYS_PER_YEAR = 240
+
+
+def synthetic_symbols(n):
+    """``n`` symbols: listed companies first, made-up ones past the list."""
+    listed = sorted(all_companies)
+    return listed[:n] + [f"SYN{i:04d}" for i in range(n - len(listed))]
+
+
+def synthetic_market(n_symbols=300, years=1, seed=0, end='2025-06-30'):
+    """Cleaned long-format OHLCV frame (the shape ingest produces)."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=end, periods=int(years * DAYS_PER_YEAR), freq='C', weekmask=TRADING_DAYS)
+    shape = (n_symbols, len(dates))
+
+    start = rng.uniform(100, 2000, (n_symbols, 1))
+    close = start * np.exp(np.cumsum(rng.normal(0, 0.02, shape), axis=1))
+    open_ = close * np.exp(rng.normal(0, 0.012, shape))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.008, shape)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.008, shape)))
+    volume = rng.lognormal(8, 0.6, shape) * np.where(rng.random(shape) < 0.08, rng.uniform(2, 5, shape), 1)
+
+    return pd.DataFrame({
+        'date': np.tile(dates.values, n_symbols),
+        'symbol': np.repeat(synthetic_symbols(n_symbols), len(dates)),
+        'open': open_.ravel().round(2),
+        'high': high.ravel().round(2),
+        'low': low.ravel().round(2),
+        'close': close.ravel().round(2),
+        'volume': volume.ravel().astype(np.int64),
+    })[COLUMNS]
+
+
+def synthetic_sheet(n_symbols=300, years=1, seed=0, end='2025-06-30'):
+    """Raw string frame laid out like the sheet export."""
+    df = synthetic_market(n_symbols, years, seed, end)
+    sheet = pd.DataFrame({
+        'Date': df['date'].dt.strftime('%Y-%m-%d'),
+        'Symbol': ' ' + df['symbol'] + ' ',
+        'Open': df['open'],
+        'High': df['high'],
+        'Low': df['low'],
+        'Close': df['close'],
+        'Volume': df['volume'].map('{:,}'.format),
+    })
+    return sheet.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def write_sheet(path, n_symbols=300, years=1, seed=0, end='2025-06-30'):
+    """Write :func:`synthetic_sheet` to ``path`` as CSV and return the path."""
+    synthetic_sheet(n_symbols, years, seed, end).to_csv(path, index=False)
+    return path
+
+
+def synthetic_ticks(n_symbols=20, minutes=240, ticks_per_minute=4, seed=0, start='2025-06-30 11:00'):
+    """Intraday trades of one session, time-ordered (the live feed stand-in).
+
+    Returns ``symbol, time, price, volume`` rows; volume bursts are as
+    frequent as on the daily data so the intraday candles fire signals too.
+    """
+    rng = np.random.default_rng(seed)
+    steps = minutes * ticks_per_minute
+    offsets = (np.arange(steps) + rng.uniform(0, 1, steps)) * (60 / ticks_per_minute)
+    times = pd.Timestamp(start) + pd.to_timedelta(np.sort(offsets).round(3), unit='s')
+    shape = (steps, n_symbols)
+
+    first = rng.uniform(100, 2000, (1, n_symbols))
+    price = first * np.exp(np.cumsum(rng.normal(0, 0.003, shape), axis=0))
+    volume = rng.lognormal(4, 0.8, shape) * np.where(rng.random(shape) < 0.03, rng.uniform(5, 20, shape), 1)
+
+    return pd.DataFrame({
+        'symbol': np.tile(synthetic_symbols(n_symbols), steps),
+        'time': np.repeat(times.values, n_symbols),
+        'price': price.ravel().round(2),
+        'volume': volume.ravel().astype(np.int64) + 1,
+    })
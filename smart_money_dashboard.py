@@ -1,18 +1,30 @@
 import pandas as pd
 import streamlit as st
-import plotly.graph_objects as go
-import io
 from datetime import datetime, timedelta
-import pytz
-import kaleido
-import plotly.io as pio
+import os
+from quantexo.backtest import GROUPINGS, signal_trades, summarize
+from quantexo.charts import FigureCache, price_chart, sector_heatmap
+from quantexo.data import SHEET_URL
+from quantexo.metrics import METRICS, timer
+from quantexo.sector_analytics import SECTOR_METRICS, sector_matrix
+from quantexo.sectors import companies_by_sector
+from quantexo.shared import NPT, SharedMarket
+from quantexo.signals import SIGNAL_DOCS
+from quantexo.stream import IntradayStream, StreamRunner
 
 # --- Page Setup ---
 
 st.set_page_config(page_title="Quantexo", layout="wide")
 
-with open("styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+@st.cache_resource
+def load_styles():
+    """Page CSS, read from disk once per server process."""
+    with open(os.path.join(APP_DIR, "styles.css")) as f:
+        return f"<style>{f.read()}</style>"
+
+st.markdown(load_styles(), unsafe_allow_html=True)
 
 st.markdown(
     """ <style>
@@ -22,49 +34,6 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
-# Add this near your signal detection logic or in a separate help section
-SIGNAL_DOCS = {
-    "🟢": {
-        "name": "Aggressive Buying",
-        "description": "Strong bullish candle closing near high with high volume, indicating buyer dominance",
-        "interpretation": "Potential start of an uptrend or continuation pattern"
-    },
-    "🔴": {
-        "name": "Aggressive Selling",
-        "description": "Strong bearish candle closing near low with high volume, indicating seller dominance",
-        "interpretation": "Potential start of a downtrend or continuation pattern"
-    },
-    "⛔": {
-        "name": "Buyer Absorption",
-        "description": "Bullish candle followed by price failing to drop below its open",
-        "interpretation": "Buyers absorbing all selling pressure - potential reversal signal"
-    },
-    "🚀": {
-        "name": "Seller Absorption",
-        "description": "Bearish candle followed by price failing to rise above its open",
-        "interpretation": "Sellers absorbing all buying pressure - potential reversal signal"
-    },
-    "💥": {
-        "name": "Bullish Pivot Point Breakout",
-        "description": "Price breaks above recent high with strong volume",
-        "interpretation": "Potential start of new uptrend or breakout continuation"
-    },
-    "💣": {
-        "name": "Bearish Pivot Point Breakdown",
-        "description": "Price breaks below recent low with strong volume",
-        "interpretation": "Potential start of new downtrend or breakdown continuation"
-    },
-    "🐂": {
-        "name": "Bullish Point of Interest",
-        "description": "Large bullish candle occupying >70% of range with high volume",
-        "interpretation": "Strong buying interest at this price level"
-    },
-    "🐻": {
-        "name": "Bearish Point of Interest",
-        "description": "Large bearish candle occupying >70% of range with high volume",
-        "interpretation": "Strong selling interest at this price level"
-    }
-}
 
 # Add this section near the top of your code, after imports but before main logic
 def show_help_section():
@@ -103,6 +72,7 @@ def show_help_section():
         - **Scan All**: Analyze all companies at once
         - **Download**: Export results as CSV
         - **Interactive Chart**: Zoom/pan with mouse
+        - **Detail Range**: Pick the dates drawn at full detail on long histories
         
         ---
         ## 🔢 Technical Indicators Used
@@ -125,7 +95,7 @@ def show_help_section():
         - Date, Open, High, Low, Close, Volume
         
         **Note**: 
-        - Data is cached for 1 hour (refresh to update)
+        - Data refreshes automatically after the EOD update
         - Historical data available for 1 year
         
         ---
@@ -140,33 +110,17 @@ def show_help_section():
 if st.sidebar.button("📚 Open Help Documentation"):
     show_help_section()
         
-# --- SECTOR TO COMPANY MAPPING ---
-sector_to_companies = {
-    "Commercial Banks": {"ADBL","CZBIL","EBL","GBIME","HBL","KBL","LSL","MBL","NABIL","NBL","NICA","NIMB","NMB","PCBL","PRVU","SANIMA","SBI","SBL","SCB"},
-    "Development Banks": {"CORBL","EDBL","GBBL","GRDBL","JBBL","KSBBL","LBBL","MDB","MLBL","MNBBL","NABBC","SADBL","SAPDBL","SHINE","SINDU"},
-    "Finance": {"BFC","CFCL","GFCL","GMFIL","GUFL","ICFC","JFL","MFIL","MPFL","NFS","PFL","PROFL","RLFL","SFCL","SIFC"},
-    "Hotels": {"CGH","CITY","KDL","OHL","SHL","TRH"},
-    "Hydro Power": {"AHPC", "AHL", "AKJCL", "AKPL", "API", "BARUN", "BEDC", "BHDC", "BHPL", "BGWT", "BHL", "BNHC", "BPCL", "CHCL", "CHL", "CKHL", "DHPL", "DOLTI", "DORDI", "EHPL", "GHL", "GLH", "GVL", "HDHPC", "HHL", "HPPL", "HURJA", "IHL", "JOSHI", "KKHC", "KPCL", "KBSH", "LEC", "MAKAR", "MANDU", "MBJC", "MEHL", "MEL", "MEN", "MHCL", "MHNL", "MKHC", "MKHL", "MKJC", "MMKJL", "MHL", "MCHL", "MSHL", "NGPL", "NHDL", "NHPC", "NYADI", "PPL", "PHCL", "PMHPL", "PPCL", "RADHI", "RAWA", "RHGCL", "RFPL", "RIDI", "RHPL", "RURU", "SAHAS", "SHEL", "SGHC", "SHPC", "SIKLES", "SJCL", "SMH", "SMHL", "SMJC", "SPC", "SPDL", "SPHL", "SPL", "SSHL", "TAMOR", "TPC", "TSHL", "TVCL", "UHEWA", "ULHC", "UMHL", "UMRH", "UNHPL", "UPCL", "UPPER", "USHL", "USHEC", "VLUCL"},
-    "Investment": {"CHDC","CIT","ENL","HATHY","HIDCL","NIFRA","NRN"},
-    "Life Insurance":{"ALICL","CLI","CREST","GMLI","HLI","ILI","LICN","NLIC","NLICL","PMLI","RNLI","SJLIC","SNLI","SRLI"},
-    "Manufacturing and Processing": {"BNL","BNT","GCIL","HDL","NLO","OMPL","SARBTM","SHIVM","SONA","UNL"},
-    "Microfinance": {"ACLBSL","ALBSL","ANLB","AVYAN","CBBL","CYCL","DDBL","DLBS","FMDBL","FOWAD","GBLBS","GILB","GLBSL","GMFBS","HLBSL","ILBS","JBLB","JSLBB","KMCDB","LLBS","MATRI","MERO","MLBBL","MLBS","MLBSL","MSLB","NADEP","NESDO","NICLBSL","NMBMF","NMFBS","NMLBBL","NUBL","RSDC","SAMAJ","SHLB","SKBBL","SLBBL","SLBSL","SMATA","SMB","SMFBS","SMPDA","SWBBL","SWMF","ULBSL","UNLB","USLB","VLBS","WNLB"},
-    "Non Life Insurance": {"HEI","IGI","NICL","NIL","NLG","NMIC","PRIN","RBCL","SALICO","SGIC"},
-    "Others": {"HRL","MKCL","NRIC","NRM","NTC","NWCL"},
-    "Trading": {"BBC","STC"}
-}
-
 #---UI LAYOUT---
 col1, col2, col3, col4 = st.columns([0.5,0.5,0.5,0.5])
 
 # --- Sector Selection ---
 with col1:
-    selected_sector = st.selectbox("Select Sector", options=[""]+ list(sector_to_companies.keys()), label_visibility="collapsed")
+    selected_sector = st.selectbox("Select Sector", options=[""]+ list(companies_by_sector), label_visibility="collapsed")
 
 # ---Filter Companies based on Sector ---
 with col2:
     if selected_sector:
-        filtered_companies = sorted(sector_to_companies[selected_sector])
+        filtered_companies = companies_by_sector[selected_sector]
     else:
         filtered_companies = []
     
@@ -204,188 +158,181 @@ if search_clicked:
     else:
         st.warning("⚠️ Please enter or select a company.")
         st.stop()
-else:
+    # Remembered so the chart survives reruns from its own widgets (e.g. the detail range)
+    st.session_state["company_symbol"] = company_symbol
+elif scan_all_clicked:
     company_symbol = ""
+    st.session_state.pop("company_symbol", None)
+else:
+    company_symbol = st.session_state.get("company_symbol", "")
+
+# Point QUANTEXO_DATA at a local CSV/Parquet export to run without Google Sheets
+DATA_SOURCE = os.environ.get("QUANTEXO_DATA", SHEET_URL)
+
+# Set QUANTEXO_HISTORY_DIR to keep cleaned history on disk across restarts
+HISTORY_DIR = os.environ.get("QUANTEXO_HISTORY_DIR")
+
+@st.cache_resource
+def get_shared_market():
+    """One dataset per server process, refreshed in the background after the EOD update."""
+    return SharedMarket(DATA_SOURCE, HISTORY_DIR).start()
+
+def get_snapshot():
+    """Market, signal index, features and version of one dataset; take one per section and read only from it."""
+    shared = get_shared_market()
+    snapshot = shared.snapshot()
+    if not len(snapshot.market) and shared.last_error:
+        st.error(f"🔴 Error fetching data: {str(shared.last_error)}")
+    return snapshot
+
+def get_market_data():
+    return get_snapshot().market
+
+@st.cache_resource
+def get_figure_cache():
+    """Figures keyed by (symbol, data version, view range), shared by every session."""
+    return FigureCache()
+
+@st.cache_data(max_entries=2, show_spinner="Backtesting signals...")
+def get_signal_trades(version, _snapshot):
+    """Forward returns of every placed signal; ``version`` keys the cache (``_snapshot`` is not hashed)."""
+    return signal_trades(_snapshot.market, _snapshot.index.events)
+
+# Set QUANTEXO_STREAM to a trade/bar file being appended to, or tcp://host:port, for live intraday signals
+STREAM_SOURCE = os.environ.get("QUANTEXO_STREAM")
+LIVE_REFRESH_SECONDS = 2
+
+@st.cache_resource
+def get_stream_runner():
+    """One intraday stream per server process, fed on a background thread."""
+    return StreamRunner(IntradayStream(), STREAM_SOURCE).start()
+
+def get_signal_index():
+    return get_snapshot().index
+
+def get_sheet_data(symbol, market=None):
+    if market is None:
+        market = get_market_data()
+    with timer("symbol_slice") as span:
+        df = market.get(symbol)
+        span.rows = len(df)
+    return df
+
+# Set QUANTEXO_DEBUG=1 to show the instrumentation panel in the sidebar
+DEBUG = os.environ.get("QUANTEXO_DEBUG", "") not in ("", "0")
+
+def show_metrics_panel():
+    """Per-stage timings and cache counts of this server process."""
+    snapshot = METRICS.snapshot()
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        stages = pd.DataFrame.from_dict(snapshot['stages'], orient='index')
+        if stages.empty:
+            st.caption("No measurements yet")
+        else:
+            stages['mean_seconds'] = stages['seconds'] / stages['count']
+            st.dataframe(stages.sort_values('seconds', ascending=False))
+        if snapshot['caches']:
+            st.dataframe(pd.DataFrame.from_dict(snapshot['caches'], orient='index'))
+        if snapshot['recent']:
+            st.caption("Latest events")
+            st.dataframe(pd.DataFrame(snapshot['recent'][-50:][::-1]).drop(columns='at'))
+        st.download_button("📥 Metrics JSON", METRICS.to_json(indent=1), "quantexo_metrics.json", "application/json")
+        st.download_button("📥 Prometheus text", METRICS.to_prometheus(), "quantexo_metrics.prom", "text/plain")
+        if st.button("Reset metrics"):
+            METRICS.reset()
+
+if DEBUG:
+    show_metrics_panel()
+
+# --- Sector Analytics ---
+if st.sidebar.checkbox("🏭 Sector Analytics"):
+    st.subheader("🏭 Sector Analytics")
+    # Aggregated for every sector when the data was refreshed
+    signal_index = get_signal_index()
+    sectors = signal_index.sectors
+    if sectors.empty:
+        st.info("ℹ️ No sector data available")
+    else:
+        col_metric, col_days = st.columns([1, 1])
+        with col_metric:
+            metric = st.selectbox("Metric", list(SECTOR_METRICS), format_func=lambda m: SECTOR_METRICS[m][0])
+        with col_days:
+            days = st.slider("Trading days", min_value=10, max_value=250, value=60)
+        label, midpoint = SECTOR_METRICS[metric]
+        st.plotly_chart(sector_heatmap(sector_matrix(sectors, metric, days), label, midpoint), use_container_width=True)
+        st.download_button(
+            label="📥 Download Sector Table as CSV",
+            data=signal_index.sectors_csv(),
+            file_name="Sector.Analytics_Quantexo🕵️_NEPSE.csv",
+            mime='text/csv'
+        )
 
-@st.cache_data(ttl=3600)
-def get_sheet_data(symbol, sheet_name="Daily Price"):
-    try:
-        sheet_url = f"https://docs.google.com/spreadsheets/d/1Q_En7VGGfifDmn5xuiF-t_02doPpwl4PLzxb4TBCW0Q/export?format=csv&gid=0"  # Using gid=0 for the first sheet
-        df = pd.read_csv(sheet_url)
-        df = df.iloc[:, :7]
-        df.columns = ['date', 'symbol', 'open', 'high', 'low', 'close', 'volume']
-        
-        # Filter data based on company symbol
-        df['symbol'] = df['symbol'].astype(str).str.strip().str.upper()
-        return df[df['symbol'].str.upper() == symbol.upper()]
-    except Exception as e:
-        st.error(f"🔴 Error fetching data: {str(e)}")
-        return pd.DataFrame()
-
-def detect_signals(df):
-    results = []
-    df['point_change'] = df['close'].diff().fillna(0)
-    df['tag'] = ''
-
-    min_window = min(20, max(5, len(df) // 2)) 
-    avg_volume = df['volume'].rolling(window=min_window).mean().fillna(method='bfill').fillna(df['volume'].mean())
-
-    for i in range(min(3, len(df)-1), len(df)):
-        row = df.iloc[i]
-        prev = df.iloc[i - 1]
-        next_candles = df.iloc[i + 1:min(i + 6, len(df))]
-        body = abs(row['close'] - row['open'])
-        prev_body = abs(prev['close'] - prev['open'])
-        recent_tags = df['tag'].iloc[max(0, i - 9):i]
-        
-        if (
-            row['close'] > row['open'] and
-            row['close'] >= row['high'] - (row['high'] - row['low']) * 0.1 and
-            row['volume'] > avg_volume[i] * 2 and
-            body > prev_body and
-            '🟢' not in recent_tags.values
-        ):
-            df.at[i, 'tag'] = '🟢'
-        if (
-            row['open'] > row['close'] and
-            row['close'] <= row['low'] + (row['high'] - row['low']) * 0.1 and
-            row['volume'] > avg_volume[i] * 2 and
-            body > prev_body and
-            '🔴' not in recent_tags.values
-        ):
-            df.at[i, 'tag'] = '🔴'
-        if (
-            row['close'] > row['open'] and
-            row['volume'] > avg_volume[i] * 1.2
-        ):
-            df.loc[df['tag'] == '⛔', 'tag'] = ''
-            for j, candle in next_candles.iterrows():
-                if candle['close'] < row['open']:
-                    df.at[j, 'tag'] = '⛔'
-                    break
-        if (
-            row['open'] > row['close'] and
-            row['volume'] > avg_volume[i] * 1.2
-        ):
-            df.loc[df['tag'] == '🚀', 'tag'] = ''
-            for j, candle in next_candles.iterrows():
-                if candle['close'] > row['open']:
-                    df.at[j, 'tag'] = '🚀'
-                    break
-        if (
-            i >= 10 and
-            row['high'] > max(df['high'].iloc[i - 10:i]) and
-            row['volume'] > avg_volume[i] * 1.8
-        ):
-            if not (df['tag'].iloc[i - 8:i] == '💥').any():
-                df.at[i, 'tag'] = '💥'
-        if (
-            i >= 10 and
-            row['low'] < min(df['low'].iloc[i - 10:i]) and
-            row['volume'] > avg_volume[i] * 1.8
-        ):
-            if not (df['tag'].iloc[i - 8:i] == '💣').any():
-                df.at[i, 'tag'] = '💣'
-        if (
-            row['close'] > row['open'] and
-            body > (row['high'] - row['low']) * 0.7 and
-            row['volume'] > avg_volume[i] * 2
-        ):
-            df.at[i, 'tag'] = '🐂'
-        if (
-            row['open'] > row['close'] and
-            body > (row['high'] - row['low']) * 0.7 and
-            row['volume'] > avg_volume[i] * 2
-        ):
-            df.at[i, 'tag'] = '🐻'
-
-        if df.at[i, 'tag']:
-            results.append({
-                'symbol': row['symbol'],
-                'tag': df.at[i, 'tag'],
-                'date': row['date'].strftime('%Y-%m-%d')
-            })
-    return results
+# --- Live Intraday ---
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def show_live_signals():
+    """Reruns on its own timer, so new intraday tags show up without rerunning the page."""
+    runner = get_stream_runner()
+    stream = runner.stream
+    # Only tags fired after the panel was opened are announced
+    seen = st.session_state.setdefault("live_seq", stream.seq)
+    fresh = stream.signals_since(seen)
+    for signal in fresh[-5:]:
+        st.toast(f"{signal['tag']} {signal['symbol']} at {signal['time']:%H:%M} ({signal['close']:,.2f})")
+    if fresh:
+        st.session_state["live_seq"] = fresh[-1]['seq']
+
+    if runner.error:
+        st.warning(f"⚠️ Feed error: {runner.error}")
+    st.caption(f"{runner.lines:,} feed lines ({runner.bad_lines:,} skipped), {stream.seq:,} signals, "
+               f"{len(stream.bars)} symbols")
+    signals = stream.signal_frame()
+    if signals.empty:
+        st.info("ℹ️ No intraday signals yet")
+    else:
+        st.dataframe(signals.drop(columns='seq').iloc[::-1], use_container_width=True, hide_index=True)
+    latest = stream.latest()
+    if not latest.empty:
+        st.dataframe(latest, use_container_width=True, hide_index=True)
+
+if STREAM_SOURCE and st.sidebar.checkbox("⚡ Live Intraday"):
+    st.subheader("⚡ Live Intraday Signals")
+    show_live_signals()
+
+# --- Signal Backtest ---
+if st.sidebar.checkbox("📈 Signal Backtest"):
+    st.subheader("📈 Signal Backtest")
+    st.caption("Entry at the signal bar's close; returns and hit rates are in the signal's direction")
+    snapshot = get_snapshot()
+    trades = get_signal_trades(snapshot.version, snapshot)
+    if trades.empty:
+        st.info("ℹ️ No signals to backtest")
+    else:
+        group_by = st.multiselect("Group by", GROUPINGS, default=["tag"]) or ["tag"]
+        summary = summarize(trades, group_by)
+        st.dataframe(summary, use_container_width=True)
+        st.download_button(
+            label="📥 Download Backtest as CSV",
+            data=summary.to_csv().encode('utf-8'),
+            file_name="Signal.Backtest_Quantexo🕵️_NEPSE.csv",
+            mime='text/csv'
+        )
 
 if scan_all_clicked:
     st.subheader("📊 Signal Scan Results for All Companies")
-    all_results = []
-    sheet_name = "Daily Price"
-
-    loading_container = st.empty()
-    with loading_container.container():
-        st.markdown("⏳ Preparing scan...")
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-
-    # Flatten all companies
-    all_companies = sorted(set().union(*sector_to_companies.values()))
-
-    progress = st.progress(0, text="🔍 Scanning...")
-
-    for i, symbol in enumerate(all_companies):
-        progress= (i+1) / len(all_companies)
-        progress_bar.progress(progress)
-        status_text.text(f"🔍 Scanning {symbol} ({i+1}/{len(all_companies)})")
-
-        df = get_sheet_data(symbol, sheet_name)
-        if df.empty:
-            continue
-
-        df.columns = [col.lower() for col in df.columns]
-        df['symbol'] = symbol
-        try:
-            df['date'] = pd.to_datetime(df['date'], errors='coerce')
-            numeric_cols = ['open', 'high', 'low', 'close', 'volume']
-            for col in numeric_cols:
-                df[col] = pd.to_numeric(df[col].astype(str).str.replace('[^\d.]', '', regex=True), errors='coerce')
-            df = df.dropna()
-            df.sort_values('date', inplace=True)
-            df.reset_index(drop=True, inplace=True)
-
-            if len(df) > 10:
-                df = df.tail(10).copy()  # Make a copy to avoid SettingWithCopyWarning
-                df.reset_index(drop=True, inplace=True)
-
-            if len(df) > 3:  # Need at least 3 days for some signals
-                results = detect_signals(df)
-                # Only keep signals from the most recent day (last row)
-                if results and len(results) > 0:
-                    latest_signal = max(results, key=lambda x: x['date'])
-                    all_results.append(latest_signal)
-        except Exception as e:
-            st.warning(f"⚠️ Error processing {symbol}: {str(e)}")
-
-    loading_container.empty()
-    progress_bar.empty()
-    status_text.empty()
-
-    if all_results:
-        st.toast("✅ Scan completed!", icon="✅")
-        result_df = pd.DataFrame(all_results)
-        result_df = result_df.sort_values(by="date", ascending=False)
-        
-        # Add sector information to the results
-        sector_map = {}
-        for sector, companies in sector_to_companies.items():
-            for company in companies:
-                sector_map[company] = sector
-        result_df['sector'] = result_df['symbol'].map(sector_map)
-        
-        # Reorder columns
-        result_df = result_df[['date', 'symbol', 'sector', 'tag']]
-        
-        # Format the date nicely
-        result_df['date'] = pd.to_datetime(result_df['date']).dt.strftime('%Y-%m-%d')
+    # The scan ran when the data was refreshed; this is a lookup
+    signal_index = get_signal_index()
+    result_df = signal_index.scan
 
-        st.dataframe(result_df, use_container_width=True)
+    if not result_df.empty:
+        st.toast("✅ Scan completed!", icon="✅")
+        with timer("render_scan", rows=len(result_df)):
+            st.dataframe(result_df, use_container_width=True)
 
-        nepali_tz = pytz.timezone('Asia/Kathmandu')
-        now = datetime.now(nepali_tz)
+        now = datetime.now(NPT)
         timestamp_str = now.strftime("%Y-%B-%d_%I-%M%p")
         file_name = f"Detected.Signal__{timestamp_str}_Quantexo🕵️_NEPSE.csv"
 
-        csv = result_df.to_csv(index=False).encode('utf-8')
+        csv = signal_index.scan_csv()
         st.download_button(
             label="📥 Download Results as CSV",
             data=csv,
@@ -396,154 +343,42 @@ if scan_all_clicked:
         st.toast("ℹ️ No signals found", icon="ℹ️")
 
 if company_symbol:
-    sheet_name = "Daily Price"
-    df = get_sheet_data(company_symbol, sheet_name)
+    # One dataset for the whole chart, even if a background refresh swaps in a new one meanwhile
+    snapshot = get_snapshot()
+    df = get_sheet_data(company_symbol, snapshot.market)
 
     if df.empty:
         st.warning(f"No data found for {company_symbol}")
         st.stop()
 
     try:
-        # Convert column names to lowercase
-        df.columns = [col.lower() for col in df.columns]
-
-        # Check required columns
-        required_cols = {'date', 'open', 'high', 'low', 'close', 'volume'}
-        if not required_cols.issubset(set(df.columns)):
-            st.error("❌ Missing required columns: date, open, high, low, close, volume")
-            st.stop()
-
-        # Convert and validate dates
-        df['date'] = pd.to_datetime(df['date'], errors='coerce')
-        if df['date'].isnull().any():
-            st.error("❌ Invalid date format in some rows")
-            st.stop()
-
-        # Validate numeric columns
-        numeric_cols = ['open', 'high', 'low', 'close', 'volume']
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(
-                df[col].astype(str).str.replace('[^\d.]', '', regex=True),  # Remove non-numeric chars
-                errors='coerce'
+        # Ingest already typed the rows; report the ones it had to reject
+        bad_rows = snapshot.market.rejected_rows(company_symbol)
+        if not bad_rows.empty:
+            st.warning(f"⚠️ Skipped {len(bad_rows)} invalid rows for {company_symbol}. Examples:")
+            st.dataframe(bad_rows.head())
+
+        # market.get returns the rows date-sorted with a fresh index
+        df['point_change'] = snapshot.features.get(company_symbol).point_change
+
+        # Bars inside the detail range are drawn in full, the rest as a coarse overview
+        view = None
+        first_day, last_day = df['date'].iloc[0].date(), df['date'].iloc[-1].date()
+        if first_day < last_day:
+            view = st.slider(
+                "🔍 Detail range",
+                min_value=first_day, max_value=last_day,
+                value=(max(first_day, last_day - timedelta(days=365)), last_day),
+                format="YYYY-MM-DD",
+                key=f"view_{company_symbol}"
             )
-            if df[col].isnull().any():
-                bad_rows = df[df[col].isnull()][['date', col]].head()
-                st.error(f"❌ Found {df[col].isnull().sum()} invalid values in {col} column. Examples:")
-                st.dataframe(bad_rows)
-                st.stop()
-
-        # Remove any rows with NA values
-        df = df.dropna()
-        if len(df) == 0:
-            st.error("❌ No valid data after cleaning")
-            st.stop()
-
-        # Sort and reset index
-        df.sort_values('date', inplace=True)
-        df.reset_index(drop=True, inplace=True)
 
-        # Detect signals
-        results = detect_signals(df)
-
-        
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df['date'], y=df['close'],
-            mode='lines', name='Close Price',
-            line=dict(color='lightblue', width=2),
-            customdata=df[['date', 'open', 'high', 'low', 'close', 'point_change']],
-            hovertemplate=(
-                "📅 Date: %{customdata[0]|%Y-%m-%d}<br>" +
-                "🟢 Open: %{customdata[1]:.2f}<br>" +
-                "📈 High: %{customdata[2]:.2f}<br>" +
-                "📉 Low: %{customdata[3]:.2f}<br>" +
-                "💰 LTP: %{customdata[4]:.2f}<br>" +
-                "📊 Point Change: %{customdata[5]:.2f}<extra></extra>"
-            )
-        ))  
-
-        tag_labels = {
-            '🟢': '🟢 Aggressive Buyers',
-            '🔴': '🔴 Aggressive Sellers',
-            '⛔': '⛔ Buyer Absorption',
-            '🚀': '🚀 Seller Absorption',
-            '💥': '💥 Bullish POR',
-            '💣': '💣 Bearish POR',
-            '🐂': '🐂 Bullish POI',
-            '🐻': '🐻 Bearish POI'
-        }
-
-        signals = df[df['tag'] != '']
-        for tag in signals['tag'].unique():
-            subset = signals[signals['tag'] == tag]
-            fig.add_trace(go.Scatter(
-                x=subset['date'], y=subset['close'],
-                mode='markers+text',
-                name=tag_labels.get(tag, tag),
-                text=[tag] * len(subset),
-                textposition='top center',
-                textfont=dict(size=20),
-                marker=dict(size=14, symbol="circle", color='white'),
-                customdata=subset[['open', 'high', 'low', 'close', 'point_change']].values,
-                hovertemplate=(
-                    "📅 Date: %{x|%Y-%m-%d}<br>" +
-                    "🟢 Open: %{customdata[0]:.2f}<br>" +
-                    "📈 High: %{customdata[1]:.2f}<br>" +
-                    "📉 Low: %{customdata[2]:.2f}<br>" +
-                    "🔚 Close: %{customdata[3]:.2f}<br>" +
-                    "📊 Point Change: %{customdata[4]:.2f}<br>" +
-                    f"{tag_labels.get(tag, tag)}<extra></extra>"
-                )
-            ))
-        
-        # Calculate 15 days ahead of the last date
-        last_date = df['date'].max()
-        extended_date = last_date + timedelta(days=15)
-        fig.update_layout(
-            height=800,
-            width=1800,
-            plot_bgcolor="darkslategray",
-            paper_bgcolor="darkslategray",
-            font_color="white",
-            xaxis=dict(title="Date", tickangle=-45, showgrid=False, range=[(df['date'].max() - pd.Timedelta(days=365)), extended_date]), #extend x-axis to show space after latest date
-            yaxis=dict(title="Price", showgrid=False, zeroline=True, zerolinecolor="gray", autorange=True),
-            margin=dict(l=50, r=50, b=130, t=50),
-            legend=dict(
-                orientation="h",
-                yanchor="top",
-                y=-0.2,  # Adjust this value to move further down if needed
-                xanchor="center",
-                x=0.5,
-                font=dict(size=14),
-                bgcolor="rgba(0,0,0,0)"  # Optional: keeps legend background transparent)
-            ),
-            # Add zoom and pan capabilities
-            dragmode="zoom",  # Enable box zoom
-            annotations=[
-                dict(
-                    text=f"{company_symbol} <br> Quantexo",
-                    xref="paper", yref="paper",
-                    x=0.5, y=0.5,
-                    xanchor="center", yanchor="middle",
-                    font=dict(size=25, color="rgba(59, 59, 59)"),
-                    showarrow=False
-                )
-            ]
-        )
-        fig.update_xaxes(
-            rangeselector=dict(
-                buttons=list([
-                    dict(count=1, label="1m", step="month", stepmode="backward"),
-                    dict(count=3, label="3m", step="month", stepmode="backward"),
-                    dict(count=6, label="6m", step="month", stepmode="backward"),
-                    dict(count=1, label="YTD", step="year", stepmode="todate"),
-                    dict(count=1, label="1y", step="year", stepmode="backward"),
-                    dict(step="all")
-                ])
-            )
-        )
-        with st.spinner("Rendering interactive chart..."):
+        # Markers come from the precomputed signal index
+        signals = snapshot.index.for_symbol(company_symbol)
+        figure_key = (company_symbol, snapshot.version, view)
+        with timer("figure", rows=len(df)):
+            fig = get_figure_cache().get(figure_key, lambda: price_chart(df, signals, company_symbol, view))
+        with st.spinner("Rendering interactive chart..."), timer("render_chart", rows=len(df)):
             st.plotly_chart(fig, use_container_width=False)
             st.success("✅ Chart rendered!")
         with st.expander("📚 Signal Reference Guide", expanded=False):
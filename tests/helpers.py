@@ -0,0 +1,115 @@
+"""Test data: seeded random histories and the baseline per-row detector."""
+import numpy as np
+import pandas as pd
+
+
+def random_history(rng, n, integer_prices=False, symbol='X', start='2020-01-01'):
+    """``n`` cleaned, date-sorted bars of one symbol with frequent volume spikes.
+
+    Integer prices make ties between open, close, high and low common.
+    """
+    close = 100 + np.cumsum(rng.normal(0, 2, n))
+    open_ = close + rng.normal(0, 2, n)
+    if integer_prices:
+        close, open_ = np.round(close), np.round(open_)
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 1, n)) * (rng.random(n) < 0.7)
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 1, n)) * (rng.random(n) < 0.7)
+    if integer_prices:
+        high, low = np.round(high + 0.4), np.round(low - 0.4)
+    volume = rng.integers(100, 500, n) * np.where(rng.random(n) < 0.25, rng.integers(2, 6, n), 1)
+    return pd.DataFrame({
+        'date': pd.bdate_range(start, periods=n),
+        'symbol': symbol,
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume.astype(np.float64),
+    })
+
+
+def baseline_detect_signals(df):
+    """The original per-row detector, kept verbatim as the reference."""
+    results = []
+    df['point_change'] = df['close'].diff().fillna(0)
+    df['tag'] = ''
+
+    min_window = min(20, max(5, len(df) // 2))
+    avg_volume = df['volume'].rolling(window=min_window).mean().fillna(method='bfill').fillna(df['volume'].mean())
+
+    for i in range(min(3, len(df)-1), len(df)):
+        row = df.iloc[i]
+        prev = df.iloc[i - 1]
+        next_candles = df.iloc[i + 1:min(i + 6, len(df))]
+        body = abs(row['close'] - row['open'])
+        prev_body = abs(prev['close'] - prev['open'])
+        recent_tags = df['tag'].iloc[max(0, i - 9):i]
+
+        if (
+            row['close'] > row['open'] and
+            row['close'] >= row['high'] - (row['high'] - row['low']) * 0.1 and
+            row['volume'] > avg_volume[i] * 2 and
+            body > prev_body and
+            '🟢' not in recent_tags.values
+        ):
+            df.at[i, 'tag'] = '🟢'
+        if (
+            row['open'] > row['close'] and
+            row['close'] <= row['low'] + (row['high'] - row['low']) * 0.1 and
+            row['volume'] > avg_volume[i] * 2 and
+            body > prev_body and
+            '🔴' not in recent_tags.values
+        ):
+            df.at[i, 'tag'] = '🔴'
+        if (
+            row['close'] > row['open'] and
+            row['volume'] > avg_volume[i] * 1.2
+        ):
+            df.loc[df['tag'] == '⛔', 'tag'] = ''
+            for j, candle in next_candles.iterrows():
+                if candle['close'] < row['open']:
+                    df.at[j, 'tag'] = '⛔'
+                    break
+        if (
+            row['open'] > row['close'] and
+            row['volume'] > avg_volume[i] * 1.2
+        ):
+            df.loc[df['tag'] == '🚀', 'tag'] = ''
+            for j, candle in next_candles.iterrows():
+                if candle['close'] > row['open']:
+                    df.at[j, 'tag'] = '🚀'
+                    break
+        if (
+            i >= 10 and
+            row['high'] > max(df['high'].iloc[i - 10:i]) and
+            row['volume'] > avg_volume[i] * 1.8
+        ):
+            if not (df['tag'].iloc[i - 8:i] == '💥').any():
+                df.at[i, 'tag'] = '💥'
+        if (
+            i >= 10 and
+            row['low'] < min(df['low'].iloc[i - 10:i]) and
+            row['volume'] > avg_volume[i] * 1.8
+        ):
+            if not (df['tag'].iloc[i - 8:i] == '💣').any():
+                df.at[i, 'tag'] = '💣'
+        if (
+            row['close'] > row['open'] and
+            body > (row['high'] - row['low']) * 0.7 and
+            row['volume'] > avg_volume[i] * 2
+        ):
+            df.at[i, 'tag'] = '🐂'
+        if (
+            row['open'] > row['close'] and
+            body > (row['high'] - row['low']) * 0.7 and
+            row['volume'] > avg_volume[i] * 2
+        ):
+            df.at[i, 'tag'] = '🐻'
+
+        if df.at[i, 'tag']:
+            results.append({
+                'symbol': row['symbol'],
+                'tag': df.at[i, 'tag'],
+                'date': row['date'].strftime('%Y-%m-%d')
+            })
+    return results
@@ -0,0 +1,90 @@
+"""Forward-return backtest against a per-trade loop."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantexo.backtest import HORIZONS, backtest, signal_trades
+from quantexo.data import MarketData
+from quantexo.signals import BEARISH_TAGS, TAG_LABELS
+from quantexo.synthetic import synthetic_market
+
+
+@pytest.fixture(scope='module')
+def market():
+    return MarketData.from_frame(synthetic_market(12, 0.3, seed=3))
+
+
+def reference_trade(market, symbol, date, tag):
+    """Outcomes of one trade, bar by bar."""
+    bars = market.get(symbol)
+    i = int(np.flatnonzero(bars['date'] == date)[0])
+    close, high, low = (bars[col].to_numpy(dtype=float) for col in ('close', 'high', 'low'))
+    direction = -1 if tag in BEARISH_TAGS else 1
+    entry = close[i]
+    trade = {'direction': direction, 'entry': entry}
+    for n in HORIZONS:
+        if i + n >= len(bars):
+            trade.update({f'ret_{n}': np.nan, f'mfe_{n}': np.nan, f'mae_{n}': np.nan, f'hit_{n}': np.nan})
+            continue
+        ret = direction * (close[i + n] / entry - 1)
+        best_high = high[i + 1:i + n + 1].max() / entry - 1
+        worst_low = low[i + 1:i + n + 1].min() / entry - 1
+        trade[f'ret_{n}'] = ret
+        trade[f'mfe_{n}'] = best_high if direction == 1 else -worst_low
+        trade[f'mae_{n}'] = worst_low if direction == 1 else -best_high
+        trade[f'hit_{n}'] = float(ret > 0)
+    return trade
+
+
+def sampled_signals(market, rng, count):
+    """Random bars of the market, with extra weight on each symbol's last bars."""
+    frame = market.to_frame()
+    tail = market.to_frame(tail=max(HORIZONS) + 1)
+    rows = pd.concat([frame.sample(count, random_state=1), tail.sample(count // 2, random_state=2)])
+    return pd.DataFrame({
+        'symbol': rows['symbol'].to_numpy(),
+        'date': rows['date'].dt.strftime('%Y-%m-%d').to_numpy(),
+        'tag': rng.choice(list(TAG_LABELS), len(rows)),
+    })
+
+
+def test_trades_match_per_trade_loop(market):
+    signals = sampled_signals(market, np.random.default_rng(0), 300)
+    trades = signal_trades(market, signals)
+    assert len(trades) == len(signals)
+    expected = pd.DataFrame([reference_trade(market, *signal) for signal in signals.itertuples(index=False)])
+    for column in expected.columns:
+        np.testing.assert_allclose(trades[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float),
+                                   rtol=1e-12, err_msg=column)
+    # Trades near a symbol's last bar have no outcome past its end
+    assert trades[f'ret_{max(HORIZONS)}'].isna().any() and trades['ret_1'].notna().any()
+
+
+def test_bearish_outcomes_are_sign_flipped(market):
+    symbol = market.symbols[0]
+    date = market.get(symbol)['date'].iloc[10].strftime('%Y-%m-%d')
+    bull, bear = signal_trades(market, [(symbol, date, '🟢'), (symbol, date, '🔴')]).to_dict('records')
+    assert (bull['direction'], bear['direction']) == (1, -1)
+    for n in HORIZONS:
+        assert bear[f'ret_{n}'] == -bull[f'ret_{n}']
+        assert bear[f'mfe_{n}'] == -bull[f'mae_{n}'] and bear[f'mae_{n}'] == -bull[f'mfe_{n}']
+        assert bull[f'hit_{n}'] + bear[f'hit_{n}'] == (1 if bull[f'ret_{n}'] else 0)
+
+
+def test_signals_outside_the_market_are_dropped(market):
+    symbol = market.symbols[1]
+    dates = market.get(symbol)['date']
+    signals = pd.DataFrame([
+        (f' {symbol.lower()} ', dates.iloc[3].strftime('%Y-%m-%d'), '🐂'),  # cleaned like the sheet
+        ('NOSUCH', dates.iloc[3].strftime('%Y-%m-%d'), '🐂'),
+        (symbol, (dates.iloc[-1] + pd.Timedelta(days=30)).strftime('%Y-%m-%d'), '🐂'),
+        (symbol, (dates.iloc[0] - pd.Timedelta(days=30)).strftime('%Y-%m-%d'), '🐻'),
+        (symbol, dates.iloc[-1].strftime('%Y-%m-%d'), '🐻'),
+    ], columns=['symbol', 'date', 'tag'])
+    trades = signal_trades(market, signals)
+    assert trades['symbol'].tolist() == [symbol, symbol]
+    assert trades['date'].tolist() == [dates.iloc[3], dates.iloc[-1]]
+    assert trades.iloc[1][[f'ret_{n}' for n in HORIZONS]].isna().all()
+
+    summary = backtest(market, signals)
+    assert summary['signals'].to_dict() == {'🐂': 1, '🐻': 1}
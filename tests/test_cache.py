@@ -0,0 +1,38 @@
+"""LRU cache behind the feature store and the figure cache."""
+from quantexo.cache import LRUCache
+from quantexo.data import MarketData
+from quantexo.features import FeatureStore
+from quantexo.metrics import METRICS
+from quantexo.synthetic import synthetic_market
+
+
+def test_least_recently_used_goes_first():
+    METRICS.reset()
+    cache = LRUCache('test', 2)
+    builds = []
+
+    def build(key):
+        return lambda: builds.append(key) or key.upper()
+
+    assert cache.get('a', build('a')) == 'A'
+    assert cache.get('b', build('b')) == 'B'
+    assert cache.get('a', build('a')) == 'A'  # 'a' is now the most recent
+    cache.get('c', build('c'))  # evicts 'b'
+    assert cache.get('a', build('a')) == 'A'
+    assert cache.get('b', build('b')) == 'B'
+    assert builds == ['a', 'b', 'c', 'b'] and len(cache) == 2
+    assert METRICS.snapshot()['caches']['test'] == {'hit': 2, 'miss': 4}
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_feature_store_keys_by_symbol_and_version():
+    market = MarketData.from_frame(synthetic_market(3, 0.1))
+    store = FeatureStore(market, version=7, maxsize=2)
+    symbol = market.symbols[0]
+    features = store.get(symbol)
+    assert store.get(f' {symbol.lower()} ') is features
+    assert len(features.close) == len(market.get(symbol))
+    for other in market.symbols[1:]:
+        store.get(other)
+    assert len(store) == 2 and store.get(symbol) is not features
@@ -0,0 +1,72 @@
+"""Headless scanner options."""
+import pandas as pd
+import pytest
+
+from quantexo.cli import main
+from quantexo.data import load_market
+from quantexo.signal_index import SignalIndex
+from quantexo.synthetic import synthetic_symbols, write_sheet
+
+
+@pytest.fixture(scope='module')
+def sheet(tmp_path_factory):
+    return write_sheet(tmp_path_factory.mktemp('sheet') / 'sheet.csv', 40, 0.5)
+
+
+def test_all_conflicts_with_symbol_selection(sheet, capsys):
+    for extra in (['--symbol', 'ADBL'], ['--sector', 'Hotels']):
+        with pytest.raises(SystemExit) as exit_info:
+            main(['--source', str(sheet), '--all'] + extra)
+        assert exit_info.value.code == 2
+        assert '--all cannot be combined' in capsys.readouterr().err
+
+
+def test_scan_to_csv(sheet, tmp_path):
+    output = tmp_path / 'signals.csv'
+    assert main(['--source', str(sheet), '--all', '--output', str(output)]) == 0
+    scan = pd.read_csv(output)
+    assert list(scan.columns) == ['date', 'symbol', 'sector', 'tag']
+    assert set(scan['symbol']) <= set(synthetic_symbols(40))
+
+
+def test_markers_for_charted_symbols_match_full_index(sheet):
+    market = load_market(str(sheet))
+    symbols = market.symbols[::7]
+    full, partial = SignalIndex.build(market), SignalIndex.for_symbols(market, symbols)
+    for symbol in market.symbols:
+        expected = full.for_symbol(symbol) if symbol in symbols else full.for_symbol(symbol).iloc[0:0]
+        pd.testing.assert_frame_equal(partial.for_symbol(symbol).reset_index(drop=True),
+                                      expected.reset_index(drop=True))
+
+
+@pytest.mark.parametrize('argv, message', [
+    (['--format', 'parquet'], 'parquet output needs --output FILE'),
+    (['--lookback', '0'], 'must be a positive integer'),
+    (['--lookback', '-3'], 'must be a positive integer'),
+    (['--workers', '0'], 'must be a positive integer'),
+])
+def test_usage_errors_before_loading(argv, message, capsys, monkeypatch):
+    def no_load(source):
+        raise AssertionError("loaded the market before checking the options")
+
+    monkeypatch.setattr('quantexo.cli.load_market', no_load)
+    with pytest.raises(SystemExit) as exit_info:
+        main(['--source', 'unused.csv'] + argv)
+    assert exit_info.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_unknown_sector_is_a_usage_error(sheet, capsys):
+    assert main(['--source', str(sheet), '--sector', 'Shipping']) == 2
+    assert "unknown sector 'Shipping'" in capsys.readouterr().err
+
+
+def test_engines_agree_on_lookback(sheet, tmp_path):
+    scans = []
+    for engine in ('batch', 'serial'):
+        output = tmp_path / f'{engine}.csv'
+        assert main(['--source', str(sheet), '--all', '--lookback', '10', '--engine', engine,
+                     '--output', str(output)]) == 0
+        scans.append(pd.read_csv(output))
+    assert len(scans[0]) > 0
+    pd.testing.assert_frame_equal(*scans)
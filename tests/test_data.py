@@ -0,0 +1,40 @@
+"""Sheet ingest: typing and rejected rows."""
+import numpy as np
+import pandas as pd
+
+from quantexo.data import MarketData, ingest_frame
+
+
+def raw_sheet(volumes):
+    n = len(volumes)
+    return pd.DataFrame({
+        'Date': ['2024-01-0%d' % (i + 1) for i in range(n)],
+        'Symbol': [' adbl '] * n,
+        'Open': ['100'] * n,
+        'High': ['1,010.5'] * n,
+        'Low': ['99'] * n,
+        'Close': ['100.5'] * n,
+        'Volume': volumes,
+    })
+
+
+def test_volume_is_int64():
+    prices, rejected = ingest_frame(raw_sheet(['1,200', '300', '45']))
+    assert prices['volume'].dtype == np.int64
+    assert prices['volume'].tolist() == [1200, 300, 45]
+    assert prices['high'].dtype == np.float64
+    assert prices['symbol'].unique().tolist() == ['ADBL']
+    assert rejected.empty
+
+
+def test_fractional_volume_is_rejected():
+    prices, rejected = ingest_frame(raw_sheet(['1,200', '300.5', 'n/a']))
+    assert prices['volume'].dtype == np.int64
+    assert prices['volume'].tolist() == [1200]
+    assert rejected['reason'].tolist() == ['volume', 'volume']
+
+
+def test_empty_market_dtypes():
+    market = MarketData.empty()
+    assert market.columns['volume'].dtype == np.int64
+    assert market.columns['close'].dtype == np.float64
@@ -0,0 +1,164 @@
+"""Sheet download against a local HTTP stand-in."""
+import asyncio
+import io
+import threading
+
+import pandas as pd
+import pytest
+
+from quantexo.data import CSV_OPTIONS, SheetSource, ingest_frame
+from quantexo.fetch import FetchError, NotModified, fetch_csv_sync
+from quantexo.history import HistoryStore
+from quantexo.shared import SharedMarket
+from quantexo.synthetic import synthetic_sheet
+
+web = pytest.importorskip('aiohttp.web')
+
+ETAG = '"sheet-v1"'
+FAST = dict(backoff=0.01, read_timeout=2, total_timeout=10)
+
+
+class StandIn:
+    """Serves one CSV body; set ``fail``, ``slow`` or ``cut`` to misbehave on the next requests."""
+
+    def __init__(self, body):
+        self.body = body
+        self.requests = 0
+        self.fail = self.cut = 0
+        self.slow = 0.0
+        self.finished = threading.Event()  # set when a request handler returns
+
+    async def handle(self, request):
+        try:
+            return await self._respond(request)
+        finally:
+            self.finished.set()
+
+    async def _respond(self, request):
+        self.requests += 1
+        if self.fail:
+            self.fail -= 1
+            return web.Response(status=503)
+        if request.headers.get('If-None-Match') == ETAG:
+            return web.Response(status=304)
+        if self.slow:
+            await asyncio.sleep(self.slow)
+        response = web.StreamResponse(headers={'ETag': ETAG, 'Content-Type': 'text/csv',
+                                               'Content-Length': str(len(self.body))})
+        await response.prepare(request)
+        half = len(self.body) // 2
+        await response.write(self.body[:half])
+        if self.cut:
+            self.cut -= 1
+            request.transport.close()  # disconnect mid-body
+            return response
+        await response.write(self.body[half:])
+        await response.write_eof()
+        return response
+
+
+@pytest.fixture(scope='module')
+def server():
+    sheet = synthetic_sheet(10, 0.2)
+    stand_in = StandIn(sheet.to_csv(index=False).encode())
+    app = web.Application()
+    app.router.add_get('/sheet.csv', stand_in.handle)
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    loop.run_until_complete(site.start())
+    port = site._server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield stand_in, f'http://127.0.0.1:{port}/sheet.csv', sheet
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+@pytest.fixture
+def stand_in(server):
+    stand_in, url, sheet = server
+    stand_in.requests = stand_in.fail = stand_in.cut = 0
+    stand_in.slow = 0.0
+    return stand_in, url, sheet
+
+
+def test_download_parses_sheet(stand_in):
+    _, url, sheet = stand_in
+    fetched = fetch_csv_sync(url, CSV_OPTIONS, **FAST)
+    assert fetched.etag == ETAG and fetched.attempts == 1
+    expected = ingest_frame(pd.read_csv(io.StringIO(sheet.to_csv(index=False)), **CSV_OPTIONS))
+    pd.testing.assert_frame_equal(ingest_frame(fetched.frame).prices, expected.prices)
+
+
+def test_retries_after_503(stand_in):
+    server, url, sheet = stand_in
+    server.fail = 2
+    fetched = fetch_csv_sync(url, **FAST)
+    assert fetched.attempts == 3 and server.requests == 3
+    assert len(fetched.frame) == len(sheet)
+
+
+def test_gives_up_after_retries(stand_in):
+    server, url, _ = stand_in
+    server.fail = 10
+    with pytest.raises(FetchError, match='503'):
+        fetch_csv_sync(url, retries=1, **FAST)
+    assert server.requests == 2
+
+
+def test_read_timeout(stand_in):
+    server, url, _ = stand_in
+    server.slow = 1.0
+    server.finished.clear()
+    with pytest.raises(FetchError):
+        fetch_csv_sync(url, retries=0, backoff=0.01, read_timeout=0.2, total_timeout=10)
+    # Let the stalled handler finish before the server shuts down
+    assert server.finished.wait(5)
+
+
+def test_mid_body_disconnect(stand_in):
+    server, url, sheet = stand_in
+    server.cut = 1
+    with pytest.raises(FetchError):
+        fetch_csv_sync(url, retries=0, **FAST)
+    # The next attempt downloads the whole body
+    server.cut = 1
+    fetched = fetch_csv_sync(url, retries=1, **FAST)
+    assert fetched.attempts == 2 and len(fetched.frame) == len(sheet)
+
+
+def test_unchanged_sheet_is_not_modified(stand_in):
+    server, url, sheet = stand_in
+    source = SheetSource(url, **FAST)
+    assert len(source.read(**CSV_OPTIONS)) == len(sheet)
+    assert source.etag == ETAG
+    with pytest.raises(NotModified):
+        source.read(**CSV_OPTIONS)
+    assert server.requests == 2
+
+
+def test_failed_processing_downloads_again(stand_in, tmp_path, monkeypatch):
+    server, url, sheet = stand_in
+    append = HistoryStore.append
+    calls = []
+
+    def failing_append(self, df):
+        calls.append(len(df))
+        if len(calls) == 1:
+            raise OSError("disk full")
+        return append(self, df)
+
+    monkeypatch.setattr(HistoryStore, 'append', failing_append)
+    shared = SharedMarket(SheetSource(url, **FAST), history_dir=tmp_path)
+    assert not shared.refresh()
+    assert isinstance(shared.last_error, OSError) and shared.market is None
+    # The retry must not be answered with a 304 for a sheet that was never stored
+    assert shared.refresh()
+    assert server.requests == 2 and calls == [len(sheet)] * 2
+    assert len(shared.market) == len(sheet)
+    with pytest.raises(NotModified):
+        shared.source.read(**CSV_OPTIONS)
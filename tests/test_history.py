@@ -0,0 +1,91 @@
+"""On-disk history: delta refresh, column reads and concurrent writers."""
+import json
+import os
+
+import pandas as pd
+
+from quantexo.data import FileSource
+from quantexo.history import MANIFEST, HistoryStore
+from quantexo.synthetic import synthetic_sheet
+
+
+def write_sheet(path, sheet):
+    sheet.to_csv(path, index=False)
+    return FileSource(path)
+
+
+def sheet_until(sheet, end):
+    return sheet[pd.to_datetime(sheet.iloc[:, 0]) <= end]
+
+
+def assert_no_duplicates(store):
+    for symbol in store.symbols:
+        dates = store.read(symbol, ['date'])['date']
+        assert dates.is_unique and dates.is_monotonic_increasing, symbol
+
+
+def test_delta_refresh(tmp_path):
+    sheet = synthetic_sheet(6, 0.2)
+    dates = pd.to_datetime(sheet.iloc[:, 0])
+    cut = dates.sort_values().unique()[-5]
+    store = HistoryStore(tmp_path / 'store')
+
+    first = store.refresh(write_sheet(tmp_path / 'old.csv', sheet_until(sheet, cut)))
+    assert first == (dates <= cut).sum() and store.version == 1
+    assert store.last_date() == cut
+
+    source = write_sheet(tmp_path / 'new.csv', sheet)
+    assert store.refresh(source) == (dates > cut).sum()
+    assert store.version == 2 and store.last_date() == dates.max()
+    # Nothing new: no writes, no new version
+    assert store.refresh(source) == 0 and store.version == 2
+
+    market = store.load_market()
+    assert len(market) == len(sheet) and len(market.symbols) == 6
+    reopened = HistoryStore(tmp_path / 'store')
+    assert reopened.version == 2 and reopened.symbols == store.symbols
+    assert_no_duplicates(store)
+
+
+def test_column_pruning(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.refresh(write_sheet(tmp_path / 'sheet.csv', synthetic_sheet(3, 0.1)))
+    symbol = store.symbols[0]
+    closes = store.read(symbol, ['date', 'close'])
+    assert list(closes.columns) == ['date', 'close']
+    assert closes.equals(store.read(symbol)[['date', 'close']])
+    assert list(store.read_market(['symbol', 'volume']).columns) == ['symbol', 'volume']
+    assert list(store.read('UNKNOWN', ['date']).columns) == ['date']
+
+
+def test_two_stores_do_not_duplicate_rows(tmp_path):
+    source = write_sheet(tmp_path / 'sheet.csv', synthetic_sheet(4, 0.1))
+    # e.g. the cron CLI and the dashboard on one directory
+    first, second = HistoryStore(tmp_path / 'store'), HistoryStore(tmp_path / 'store')
+    written = first.refresh(source)
+    assert written > 0
+    assert second.refresh(source) == 0
+    assert len(second.load_market()) == written
+    assert_no_duplicates(second)
+
+
+def test_manifest_behind_the_files(tmp_path):
+    sheet = synthetic_sheet(4, 0.1)
+    cut = pd.to_datetime(sheet.iloc[:, 0]).sort_values().unique()[-3]
+    store = HistoryStore(tmp_path / 'store')
+    store.refresh(write_sheet(tmp_path / 'old.csv', sheet_until(sheet, cut)))
+    manifest = os.path.join(store.root, MANIFEST)
+    with open(manifest) as f:
+        before = json.load(f)
+
+    source = write_sheet(tmp_path / 'new.csv', sheet)
+    store.refresh(source)
+    # A crash after the Parquet writes but before the manifest write
+    with open(manifest, 'w') as f:
+        json.dump(before, f)
+    store = HistoryStore(tmp_path / 'store')
+    assert store.refresh(source) == 0
+    assert len(store.load_market()) == len(sheet)
+    assert store.last_date() == pd.to_datetime(sheet.iloc[:, 0]).max()
+    assert_no_duplicates(store)
+    assert not os.path.exists(os.path.join(store.root, '_manifest.lock'))
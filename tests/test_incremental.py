@@ -0,0 +1,117 @@
+"""Incremental updates against a full recompute of the same history."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import quantexo.incremental
+from quantexo.incremental import WARM_BARS, IncrementalDetector, SymbolState
+from quantexo.signals import DEFAULT_PARAMS, TagReplay, detect_signals, detect_signals_batch
+from tests.helpers import random_history
+
+
+def full_recompute(history, params=DEFAULT_PARAMS):
+    """Tag of the last bar and the ⛔/🚀 mark rows after tagging ``history`` in full."""
+    df = history.reset_index(drop=True).copy()
+    records = detect_signals(df, params)
+    last = df['date'].iloc[-1].strftime('%Y-%m-%d')
+    tag = records[-1]['tag'] if records and records[-1]['date'] == last else ''
+    marks = {}
+    for mark in ('⛔', '🚀'):
+        rows = np.flatnonzero(df['tag'].to_numpy() == mark)
+        marks[mark] = int(rows[0]) if len(rows) else -1
+    return tag, marks
+
+
+def assert_appends_match(history, bootstrap, params=DEFAULT_PARAMS):
+    state = SymbolState.from_history('X', history.iloc[:bootstrap])
+    for k in range(bootstrap, len(history)):
+        bar = history.iloc[k]
+        tag = state.update(bar.date, bar.open, bar.high, bar.low, bar.close, bar.volume)
+        assert (tag, state.marks) == full_recompute(history.iloc[:k + 1], params), f"bar {k} after bootstrapping {bootstrap}"
+
+
+@pytest.mark.parametrize('bootstrap', [0, 1, 10, WARM_BARS - 1, WARM_BARS, WARM_BARS + 1, 80])
+def test_append_matches_full_recompute(bootstrap):
+    rng = np.random.default_rng(bootstrap)
+    for trial in range(6):
+        history = random_history(rng, bootstrap + int(rng.integers(1, 40)), integer_prices=trial % 2 == 0)
+        assert_appends_match(history, bootstrap)
+
+
+def test_thresholds_come_from_default_params(monkeypatch):
+    params = DEFAULT_PARAMS._replace(heavy_volume=1.5, surge_volume=1.3, active_volume=1.1,
+                                     extreme_band=0.25, body_ratio=0.55, aggressive_cooldown=4)
+    monkeypatch.setattr(quantexo.incremental, 'DEFAULT_PARAMS', params)
+    rng = np.random.default_rng(5)
+    for trial in range(6):
+        history = random_history(rng, WARM_BARS + 60, integer_prices=trial % 2 == 0)
+        assert_appends_match(history, WARM_BARS + int(rng.integers(0, 10)), params)
+
+
+def test_random_bootstrap_points():
+    rng = np.random.default_rng(11)
+    for trial in range(40):
+        history = random_history(rng, int(rng.integers(5, 120)), integer_prices=trial % 2 == 0)
+        assert_appends_match(history, int(rng.integers(0, len(history))))
+
+
+def pending_triggers():
+    """Flat history with a bull then a bear absorption trigger on bars ``n - 2`` and ``n - 1``.
+
+    Neither follows through until bars ``n`` (🚀) and ``n + 1`` (⛔), so both
+    watches are pending when the state is bootstrapped from ``n`` bars.
+    """
+    n = WARM_BARS + 5
+    df = pd.DataFrame({
+        'date': pd.bdate_range('2024-01-01', periods=n + 2),
+        'symbol': 'X',
+        'open': 100.0, 'high': 101.0, 'low': 99.0, 'close': 100.2, 'volume': 100.0,
+    })
+    bars = [
+        (100.0, 103.5, 99.8, 103.0, 300.0),  # bull trigger, open 100
+        (104.0, 104.5, 100.8, 101.0, 300.0),  # bear trigger, open 104; close stays above 100
+        (102.0, 105.5, 101.5, 105.0, 100.0),  # closes above 104: the 🚀 mark
+        (101.0, 101.2, 98.5, 99.0, 100.0),  # closes below 100: the ⛔ mark
+    ]
+    df.loc[n - 2:, ['open', 'high', 'low', 'close', 'volume']] = bars
+    return df, n
+
+
+def test_watches_cross_bootstrap():
+    history, bootstrap = pending_triggers()
+    state = SymbolState.from_history('X', history.iloc[:bootstrap])
+    assert state.watches['⛔'] == (bootstrap - 2, 100.0)
+    assert state.watches['🚀'] == (bootstrap - 1, 104.0)
+    assert_appends_match(history, bootstrap)
+    assert full_recompute(history)[1] == {'⛔': bootstrap + 1, '🚀': bootstrap}
+
+
+def test_marks_on_the_same_bar():
+    # The close/open rules cannot make both triggers follow through on one
+    # bar, so the shared-bar rule is checked on the replay state directly
+    replay = TagReplay()
+    replay.mark('⛔', 7)
+    replay.mark('🚀', 7)
+    assert (replay.bull_at, replay.bear_at) == (-1, 7)
+    replay.mark('⛔', 7)
+    assert (replay.bull_at, replay.bear_at) == (7, -1)
+
+
+def test_detector_append_matches_batch():
+    rng = np.random.default_rng(3)
+    market = pd.concat(
+        [random_history(rng, int(rng.choice([1, 5, 39, 41, 120])), k % 2 == 0, symbol=f'S{k:03d}', start='2024-01-01')
+         for k in range(60)],
+        ignore_index=True,
+    )
+    # Every symbol gets one more bar on the same day
+    last_day = market['date'].max() + pd.offsets.BDay()
+    new_bars = market.groupby('symbol').tail(1).assign(date=last_day)
+    new_bars['volume'] *= rng.choice([1, 4], len(new_bars))
+
+    detector = IncrementalDetector.from_market(market)
+    appended = detector.append(new_bars)
+
+    expected = detect_signals_batch(pd.concat([market, new_bars], ignore_index=True))
+    expected = expected[expected['date'] == last_day.strftime('%Y-%m-%d')].reset_index(drop=True)
+    pd.testing.assert_frame_equal(appended[['symbol', 'date', 'tag']], expected[['symbol', 'date', 'tag']])
@@ -0,0 +1,42 @@
+"""Scan engines: the batch pass against the per-symbol loop."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantexo.data import MarketData
+from quantexo.scan import scan_market, scan_market_batch
+from tests.helpers import random_history
+
+pytestmark = pytest.mark.filterwarnings('ignore::FutureWarning')
+
+
+def new_listing(n):
+    """``n`` bars ending on a big, heavy bullish candle (a 🐂 on any longer history)."""
+    df = pd.DataFrame({
+        'date': pd.bdate_range('2024-01-01', periods=n),
+        'symbol': 'X',
+        'open': 100.0, 'high': 101.0, 'low': 99.0, 'close': 100.5, 'volume': 100.0,
+    })
+    df.loc[n - 1, ['open', 'high', 'low', 'close', 'volume']] = [100.0, 111.0, 99.5, 110.0, 1000.0]
+    return df
+
+
+@pytest.mark.parametrize('n', [1, 2, 3])
+def test_batch_skips_short_symbols(n):
+    market = MarketData.from_frame(new_listing(n))
+    assert scan_market(market, executor='serial').empty
+    assert scan_market_batch(market).empty
+
+
+def test_batch_matches_loop():
+    rng = np.random.default_rng(7)
+    frames = [new_listing(4).assign(symbol='LONG')] + [
+        random_history(rng, int(rng.choice([1, 2, 3, 4, 5, 12, 40])), k % 2 == 0, symbol=f'S{k:03d}')
+        for k in range(80)
+    ]
+    market = MarketData.from_frame(pd.concat(frames, ignore_index=True))
+
+    loop = scan_market(market, executor='serial').sort_values('symbol', ignore_index=True)
+    batch = scan_market_batch(market).sort_values('symbol', ignore_index=True)
+    assert 'LONG' in set(batch['symbol'])
+    pd.testing.assert_frame_equal(batch, loop)
@@ -0,0 +1,78 @@
+"""Per-sector daily aggregates on a small hand-built market."""
+import numpy as np
+import pandas as pd
+
+from quantexo.sector_analytics import INDEX_BASE, SECTOR_VOLUME_WINDOW, sector_daily
+
+DAYS = pd.bdate_range('2024-01-01', periods=SECTOR_VOLUME_WINDOW + 5)
+
+
+def hand_market():
+    """Two banks (one listed from the third day), a hotel and a symbol without a sector."""
+    rows = []
+    for d, date in enumerate(DAYS):
+        rows.append(('ADBL', date, 100 * 1.01 ** d, 1000))
+        if d >= 2:
+            rows.append(('EBL', date, 50 + (d % 3), 10 * d))
+        rows.append(('CGH', date, 300.0, 100 * (d + 1)))
+        rows.append(('ZZZZ', date, 10.0, 5))
+    prices = pd.DataFrame(rows, columns=['symbol', 'date', 'close', 'volume'])
+    return prices.sample(frac=1, random_state=0)  # any row order
+
+
+def hand_events():
+    return pd.DataFrame([
+        ('ADBL', DAYS[2], '🟢'), ('EBL', DAYS[2], '🔴'), ('EBL', DAYS[2], '🐂'),
+        ('CGH', DAYS[3], '🚀'), ('ZZZZ', DAYS[3], '🟢'),
+    ], columns=['symbol', 'date', 'tag'])
+
+
+def test_counts_and_breadth():
+    daily = sector_daily(hand_market(), hand_events()).set_index(['sector', 'date'])
+    assert set(daily.index.get_level_values('sector')) == {'Commercial Banks', 'Hotels'}
+    banks = daily.loc['Commercial Banks']
+    assert banks['members'].tolist() == [1, 1] + [2] * (len(DAYS) - 2)
+
+    day = banks.loc[DAYS[2]]
+    assert (day['🟢'], day['🔴'], day['🐂'], day['⛔']) == (1, 1, 1, 0)
+    assert (day['bullish'], day['bearish']) == (2, 1) and day['breadth'] == 2 / 3
+    assert daily.loc[('Hotels', DAYS[3]), 'breadth'] == 0
+    # Days without signals have no breadth
+    assert banks['breadth'].drop(DAYS[2]).isna().all()
+    assert daily['🟢'].sum() == 1  # the unsectored symbol's tag is not counted
+
+
+def test_volume_ratio_uses_rolling_window():
+    hotels = sector_daily(hand_market(), hand_events()).set_index(['sector', 'date']).loc['Hotels']
+    volume = 100.0 * np.arange(1, len(DAYS) + 1)
+    average = [volume[max(0, d - SECTOR_VOLUME_WINDOW + 1):d + 1].mean() for d in range(len(DAYS))]
+    np.testing.assert_allclose(hotels['avg_volume'], average)
+    np.testing.assert_allclose(hotels['volume_ratio'], volume / average)
+    assert hotels['volume_ratio'].iloc[0] == 1
+
+
+def test_index_chains_volume_weighted_returns():
+    prices = hand_market()
+    banks = sector_daily(prices, hand_events()).set_index(['sector', 'date']).loc['Commercial Banks']
+    closes = prices.pivot(index='date', columns='symbol', values='close')
+    volumes = prices.pivot(index='date', columns='symbol', values='volume')
+    level, expected = INDEX_BASE, []
+    for d, date in enumerate(DAYS):
+        weighted = total = 0.0
+        for symbol in ('ADBL', 'EBL'):
+            # A member's first bar has no return and no weight
+            if d > 0 and not np.isnan(closes[symbol].iloc[d - 1]) and not np.isnan(closes[symbol].iloc[d]):
+                weighted += (closes[symbol].iloc[d] / closes[symbol].iloc[d - 1] - 1) * volumes[symbol].iloc[d]
+                total += volumes[symbol].iloc[d]
+        level *= 1 + (weighted / total if total else 0)
+        expected.append(level)
+    np.testing.assert_allclose(banks['index'], expected)
+    assert banks['index'].iloc[0] == INDEX_BASE
+    assert banks['index'].iloc[1] == INDEX_BASE * 1.01
+    hotels = sector_daily(prices, hand_events()).set_index(['sector', 'date']).loc['Hotels']
+    assert (hotels['index'] == INDEX_BASE).all()
+
+
+def test_empty_market():
+    empty = pd.DataFrame(columns=['symbol', 'date', 'close', 'volume'])
+    assert sector_daily(empty, hand_events().iloc[0:0]).empty
@@ -0,0 +1,129 @@
+"""Shared market dataset: first load and retries."""
+import threading
+import time
+
+import quantexo.shared
+from quantexo.shared import SharedMarket
+from quantexo.signal_index import SignalIndex
+from quantexo.synthetic import synthetic_sheet
+
+
+class FlakySource:
+    """Fails the first ``failures`` reads, then serves a small synthetic sheet."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.reads = 0
+        self.sheet = synthetic_sheet(5, 0.1)
+
+    def read(self, **options):
+        self.reads += 1
+        if self.reads <= self.failures:
+            raise OSError("sheet unavailable")
+        return self.sheet.copy()
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_failed_first_load_is_not_retried_by_readers():
+    source = FlakySource(failures=10 ** 6)
+    shared = SharedMarket(source)
+    assert len(shared.get()) == 0
+    assert isinstance(shared.last_error, OSError)
+    for _ in range(5):
+        assert len(shared.get()) == 0
+        assert len(shared.get_index().scan) == 0
+    assert source.reads == 1
+
+
+def test_refresh_thread_retries_first_load(monkeypatch):
+    monkeypatch.setattr(quantexo.shared, 'RETRY_SECONDS', 0.01)
+    source = FlakySource(failures=3)
+    shared = SharedMarket(source).start()
+    try:
+        wait_for(lambda: shared.market is not None)
+    finally:
+        shared.stop()
+    assert source.reads == 4
+    assert shared.last_error is None
+    assert len(shared.get()) > 0 and shared.version == 1
+
+
+def test_readers_wait_only_for_the_first_attempt():
+    source = FlakySource(failures=1)
+    shared = SharedMarket(source)
+    results = []
+    readers = [threading.Thread(target=lambda: results.append(len(shared.get()))) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join()
+    assert results == [0] * 4
+    assert source.reads == 1
+    assert shared.refresh()
+    assert len(shared.get()) > 0
+
+
+def test_snapshot_is_consistent_across_swaps():
+    shared = SharedMarket(FlakySource(failures=0))
+    first = shared.snapshot()
+    assert first.version == 1 and first.index.version == 1 and first.features.version == 1
+    assert shared.market is first.market and shared.version == 1
+
+    shared.source.sheet = synthetic_sheet(8, 0.2, seed=1)
+    assert shared.refresh()
+    second = shared.snapshot()
+    assert second.version == 2 and second.index.version == 2 and second.features.market is second.market
+    # A snapshot taken before the swap still reads one whole dataset
+    symbol = first.market.symbols[0]
+    assert len(first.features.get(symbol).close) == len(first.market.get(symbol))
+    assert len(second.market.symbols) == 8
+
+
+def test_empty_snapshot_after_failed_load():
+    shared = SharedMarket(FlakySource(failures=1))
+    snapshot = shared.snapshot()
+    assert snapshot.version == 0 and len(snapshot.market) == 0 and snapshot.index.scan.empty
+    assert shared.market is None and shared.version == 0
+
+
+def failing_build(monkeypatch, failures):
+    """Make the first ``failures`` index builds of a loaded market raise."""
+    build = SignalIndex.build
+    calls = []
+
+    def flaky(market, version=None):
+        if len(market) == 0:
+            return build(market, version)
+        calls.append(version)
+        if len(calls) <= failures:
+            raise ValueError("index build failed")
+        return build(market, version)
+
+    monkeypatch.setattr(SignalIndex, 'build', staticmethod(flaky))
+    return calls
+
+
+def test_failed_swap_is_a_failed_load(monkeypatch):
+    failing_build(monkeypatch, failures=1)
+    shared = SharedMarket(FlakySource(failures=0))
+    assert len(shared.get()) == 0
+    assert isinstance(shared.last_error, ValueError) and shared.market is None
+    assert shared.refresh()
+    assert shared.last_error is None and shared.version == 1
+
+
+def test_refresh_thread_survives_failed_swaps(monkeypatch):
+    monkeypatch.setattr(quantexo.shared, 'RETRY_SECONDS', 0.01)
+    calls = failing_build(monkeypatch, failures=3)
+    shared = SharedMarket(FlakySource(failures=0)).start()
+    try:
+        wait_for(lambda: shared.market is not None)
+    finally:
+        shared.stop()
+    assert len(calls) >= 4 and shared.last_error is None
@@ -0,0 +1,60 @@
+"""The columnar signal engine against the baseline per-row detector."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantexo.signals import detect_signals, detect_signals_batch, tag_market
+from tests.helpers import baseline_detect_signals, random_history
+
+pytestmark = pytest.mark.filterwarnings('ignore::FutureWarning')
+
+LENGTHS = [1, 2, 3, 4, 5, 8, 12, 15, 30, 60, 150]
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_detect_signals_matches_baseline(seed):
+    rng = np.random.default_rng(seed)
+    for trial in range(150):
+        history = random_history(rng, int(rng.choice(LENGTHS)), integer_prices=trial % 2 == 0)
+        expected, actual = history.copy(), history.copy()
+
+        assert detect_signals(actual) == baseline_detect_signals(expected)
+        assert actual['tag'].tolist() == expected['tag'].tolist()
+        pd.testing.assert_series_equal(actual['point_change'], expected['point_change'])
+
+
+@pytest.mark.parametrize('lengths', [[1, 2, 3], [4, 5], [3, 40, 1, 150, 12]])
+def test_short_histories(lengths):
+    rng = np.random.default_rng(sum(lengths))
+    for n in lengths:
+        history = random_history(rng, n, integer_prices=True)
+        expected, actual = history.copy(), history.copy()
+        assert detect_signals(actual) == baseline_detect_signals(expected)
+        assert actual['tag'].tolist() == expected['tag'].tolist()
+
+
+def test_empty_history():
+    assert detect_signals(random_history(np.random.default_rng(0), 0)) == []
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_batch_matches_baseline(seed):
+    rng = np.random.default_rng(100 + seed)
+    histories = [
+        random_history(rng, int(rng.choice(LENGTHS)), integer_prices=k % 2 == 0, symbol=f'S{k:03d}')
+        for k in range(60)
+    ]
+    expected_records, expected_tags = [], []
+    for history in histories:
+        history = history.copy()
+        expected_records.extend(baseline_detect_signals(history))
+        expected_tags.extend(history['tag'])
+    # Rows in any order: the batch engine sorts by symbol and date itself
+    market = pd.concat(histories, ignore_index=True).sample(frac=1, random_state=seed)
+
+    signals = detect_signals_batch(market)
+    assert signals[['symbol', 'tag', 'date']].to_dict('records') == expected_records
+
+    tagged, placed = tag_market(market)
+    assert tagged['tag'].tolist() == expected_tags
+    assert len(placed) == len(expected_records)
@@ -0,0 +1,132 @@
+"""Intraday streaming: candles, live tags and the feed runner."""
+import socket
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import quantexo.stream
+from quantexo.features import Features
+from quantexo.signals import resolve_tags, signal_masks
+from quantexo.stream import CandleBuilder, IntradayStream, StreamRunner, parse_line, replay
+from quantexo.synthetic import synthetic_ticks
+
+
+def test_parse_line():
+    assert parse_line('adbl,2025-06-30 11:00:05,100.5,20') == (
+        'ADBL', pd.Timestamp('2025-06-30 11:00:05'), 100.5, 100.5, 100.5, 100.5, 20.0)
+    assert parse_line('{"symbol": "X", "time": "2025-06-30 11:01", "open": 1, "high": 2, "low": 0.5, '
+                      '"close": 1.5, "volume": 7}')[2:] == (1.0, 2.0, 0.5, 1.5, 7.0)
+    for line in ('symbol,time,price,volume', '', 'X,2025-06-30,1', '{"symbol": "X"}'):
+        assert parse_line(line) is None
+
+
+def test_candles_close_on_feed_time():
+    candles = CandleBuilder('1min')
+    at = pd.Timestamp('2025-06-30 11:00')
+    assert candles.add('A', at, 10, 10, 10, 10, 1) == []
+    assert candles.add('A', at + pd.Timedelta('30s'), 12, 12, 12, 12, 2) == []
+    assert candles.add('B', at + pd.Timedelta('40s'), 5, 5, 5, 5, 1) == []
+    completed = candles.add('B', at + pd.Timedelta('70s'), 6, 6, 6, 6, 1)
+    assert sorted(completed) == [('A', at, 10, 12, 10, 12, 3), ('B', at, 5, 5, 5, 5, 1)]
+    assert candles.add('A', at + pd.Timedelta('10s'), 1, 1, 1, 1, 1) == []
+    assert candles.late == 1
+
+
+def test_live_tags_match_reruns_over_candles():
+    ticks = synthetic_ticks(4, 90, seed=2)
+    stream = IntradayStream(window=50)
+    for line in replay(ticks):
+        stream.push_line(line)
+    stream.flush()
+
+    ticks['date'] = ticks['time'].dt.floor('1min')
+    candles = ticks.groupby(['symbol', 'date']).agg(
+        open=('price', 'first'), high=('price', 'max'), low=('price', 'min'),
+        close=('price', 'last'), volume=('volume', 'sum')).reset_index()
+    expected = set()
+    for symbol, bars in candles.groupby('symbol'):
+        bars = bars.reset_index(drop=True)
+        # A live tag can only use the candles completed so far
+        for n in range(1, len(bars) + 1):
+            placed, _ = resolve_tags(signal_masks(Features.from_columns(bars.iloc[:n])))
+            if placed and placed[-1][0] == n - 1:
+                expected.add((symbol, bars['date'][n - 1], placed[-1][1]))
+    assert {(s['symbol'], s['time'], s['tag']) for s in stream.signals} == expected
+    assert stream.seq == len(expected) > 0
+    assert all(len(bars) == 50 for bars in stream.bars.values())
+
+
+def test_listeners_may_read_the_stream():
+    ticks = synthetic_ticks(3, 60, seed=4)
+    stream = IntradayStream()
+    seen = []
+    stream.subscribe(lambda signal: seen.append((signal['seq'], len(stream.signals_since(0)))))
+
+    def feed():
+        for line in replay(ticks):
+            stream.push_line(line)
+        stream.flush()
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    feeder.join(10)
+    assert not feeder.is_alive(), "feed deadlocked in a listener"
+    assert [seq for seq, _ in seen] == list(range(1, stream.seq + 1))
+    # Signals of one push are all recorded before its listeners run
+    assert all(kept >= seq for seq, kept in seen)
+
+
+def test_runner_waits_before_reconnecting(monkeypatch):
+    monkeypatch.setattr(quantexo.stream, 'RETRY_SECONDS', 0.2)
+    server = socket.create_server(('127.0.0.1', 0))
+    port = server.getsockname()[1]
+    connections = []
+
+    def accept_and_close():
+        while True:
+            try:
+                client, _ = server.accept()
+            except OSError:
+                return
+            connections.append(time.monotonic())
+            client.close()
+
+    threading.Thread(target=accept_and_close, daemon=True).start()
+    runner = StreamRunner(IntradayStream(), f'tcp://127.0.0.1:{port}').start()
+    time.sleep(0.7)
+    runner.stop()
+    server.close()
+    assert 2 <= len(connections) <= 5
+    assert np.all(np.diff(connections) >= 0.15)
+
+
+def test_parse_line_normalises_times_and_rejects_non_finite():
+    aware = parse_line('X,2025-06-30T11:00:00+05:45,100,10')
+    assert aware[1] == pd.Timestamp('2025-06-30 11:00') and aware[1].tzinfo is None
+    assert parse_line('X,2025-06-30T05:15:00Z,100,10')[1] == pd.Timestamp('2025-06-30 11:00')
+    for line in ('X,2025-06-30 11:00,nan,10', 'X,2025-06-30 11:00,100,inf', 'X,NaT,100,10',
+                 'X,2025-06-30 11:00,1,nan,1,1,5', '{"symbol": "X", "time": "2025-06-30", "price": NaN, "volume": 1}'):
+        assert parse_line(line) is None
+
+
+def test_runner_skips_bad_lines(tmp_path, monkeypatch):
+    feed = tmp_path / 'feed.csv'
+    feed.write_text('X,2025-06-30T11:00:00+05:45,100,10\n'
+                    'X,2025-06-30T11:01:00,101,10\n'
+                    'X,2025-06-30T11:02:00,102,10\n')
+    stream = IntradayStream()
+    push = stream.push
+
+    def failing_push(*record):
+        if record[2] == 101:
+            raise TypeError("cannot process")
+        return push(*record)
+
+    monkeypatch.setattr(stream, 'push', failing_push)
+    runner = StreamRunner(stream, str(feed), follow=False).start()
+    runner._thread.join(5)
+    assert not runner.running
+    assert runner.lines == 3 and runner.bad_lines == 1 and isinstance(runner.error, TypeError)
+    assert list(stream.recent_bars('X')['close']) == [100, 102]
@@ -0,0 +1,63 @@
+"""Parameter sets and sweeps."""
+import pytest
+
+from quantexo.data import MarketData
+from quantexo.signals import DEFAULT_PARAMS
+from quantexo.sweep import grid, main, random_search, sweep
+from quantexo.synthetic import synthetic_market
+
+
+def test_grid_types_values():
+    sets = grid(heavy_volume=['1.5', '2'], breakout_lookback=['5', '10.0'])
+    assert len(sets) == 4
+    assert {(p.heavy_volume, p.breakout_lookback) for p in sets} == {(1.5, 5), (1.5, 10), (2.0, 5), (2.0, 10)}
+    assert all(isinstance(p.breakout_lookback, int) for p in sets)
+
+
+@pytest.mark.parametrize('values, message', [
+    ({'breakout_lookback': [0]}, 'breakout_lookback'),
+    ({'volume_window': [0]}, 'volume_window'),
+    ({'min_volume_window': [-1]}, 'min_volume_window'),
+    ({'body_ratio': [1.5]}, 'body_ratio'),
+    ({'heavy_volume': [0]}, 'heavy_volume'),
+    ({'aggressive_cooldown': [-2]}, 'aggressive_cooldown'),
+    ({'breakout_lookback': [2.5]}, 'whole number'),
+    ({'surge_volume': ['fast']}, 'not a number'),
+    ({'no_such_field': [1]}, 'unknown parameter'),
+])
+def test_grid_rejects_bad_values(values, message):
+    with pytest.raises(ValueError, match=message):
+        grid(**values)
+
+
+def test_random_search_rejects_bad_ranges():
+    with pytest.raises(ValueError, match='volume_window'):
+        random_search(5, 0, volume_window=(0, 3), breakout_lookback=(5, 10))
+    sets = random_search(20, 0, breakout_lookback=(1, 20), body_ratio=(0.5, 0.9))
+    assert all(1 <= p.breakout_lookback <= 20 and 0.5 <= p.body_ratio <= 0.9 for p in sets)
+
+
+def test_sweep_ranks_valid_sets():
+    market = MarketData.from_frame(synthetic_market(20, 0.5))
+    results = sweep(market, [DEFAULT_PARAMS] + grid(heavy_volume=[1.5, 3]), executor='serial', min_signals=0)
+    assert results['rank'].tolist() == [1, 2, 3]
+    with pytest.raises(ValueError, match='breakout_lookback'):
+        sweep(market, [DEFAULT_PARAMS._replace(breakout_lookback=0)], executor='serial')
+    for horizon in (0, -1):
+        with pytest.raises(ValueError, match='horizons must be at least 1'):
+            sweep(market, [DEFAULT_PARAMS], horizon=horizon, executor='serial')
+
+
+def test_cli_reports_bad_values(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(['--source', 'unused.csv', '--grid', 'breakout_lookback=0'])
+    assert exit_info.value.code == 2
+    assert 'breakout_lookback' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('horizon', ['0', '-1'])
+def test_cli_rejects_horizon_below_one(horizon, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(['--source', 'unused.csv', '--horizon', horizon])
+    assert exit_info.value.code == 2
+    assert '--horizon must be at least 1' in capsys.readouterr().err